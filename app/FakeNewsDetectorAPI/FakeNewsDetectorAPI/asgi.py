@@ -0,0 +1,23 @@
+"""
+ASGI config for FakeNewsDetectorAPI project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Serve the project with an ASGI server (e.g. uvicorn) to stream responses such
+as ``/api/usercheck/title/stream/``. Requests are cancelled when their client
+disconnects, which also stops the upstream calls of an abandoned stream.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'FakeNewsDetectorAPI.settings')
+
+django_application = get_asgi_application()
+
+from core.asgi import CancelOnDisconnect  # noqa: E402 (needs the app registry)
+
+application = CancelOnDisconnect(django_application)
@@ -86,10 +86,55 @@ WSGI_APPLICATION = 'FakeNewsDetectorAPI.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/2.1/ref/settings/#databases
 
-DATABASES = {
+# SQLite by default, through a backend that applies the pragmas below on every
+# connection: WAL lets requests read while ingestion writes, and writers wait
+# up to busy_timeout milliseconds for each other. Set DB_ENGINE=postgres (and
+# the POSTGRES_* variables) in .env to use PostgreSQL instead, keeping
+# connections open for DB_CONN_MAX_AGE seconds.
+
+if os.getenv('DB_ENGINE', 'sqlite') == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('POSTGRES_DB', 'fakenews'),
+            'USER': os.getenv('POSTGRES_USER', 'postgres'),
+            'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
+            'HOST': os.getenv('POSTGRES_HOST', 'localhost'),
+            'PORT': os.getenv('POSTGRES_PORT', '5432'),
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': True,
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'core.db.backends.sqlite3',
+            'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+            'OPTIONS': {
+                'pragmas': {
+                    'journal_mode': 'WAL',
+                    'synchronous': 'NORMAL',
+                    'busy_timeout': 20000,
+                    'mmap_size': 256 * 1024 * 1024,
+                    'cache_size': -64000,
+                    'temp_store': 'MEMORY',
+                },
+                'transaction_mode': 'IMMEDIATE',
+            },
+        }
+    }
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# The live news feed responses are cached here. With the per-process local
+# memory cache, rows ingested by another process (run_ingest) show up within
+# LIVENEWS_RESPONSE_CACHE_TTL seconds; a shared backend such as Redis or
+# Memcached makes ingestion invalidate every worker immediately.
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'fake-news-detector',
     }
 }
 
@@ -131,6 +176,129 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 
+# ML models
+# The model registry re-checks the pickles on disk at most this often (seconds)
+# and hot-swaps them when they change.
+MODEL_RELOAD_CHECK_INTERVAL = 30
+
+# Model format: 'pickle', an exported array format ('arrays', written by
+# `python manage.py export_model_arrays`, or 'hashed', written by
+# `python manage.py export_hashed_model`) or 'auto' to use the first exported
+# format present in that order. NB_HASH_FEATURES is the default number of
+# hash buckets.
+NB_MODEL_FORMAT = 'auto'
+NB_HASH_FEATURES = 2 ** 18
+
+# Traditional model checks return the tokens that weighed most on the prediction
+USERCHECK_TOP_TOKENS = 5
+
+# Live news ingestion
+# Sources are fetched concurrently; every source gets LIVENEWS_FETCH_TIMEOUT
+# seconds and a refresh waits at most LIVENEWS_FETCH_BUDGET seconds overall.
+LIVENEWS_FETCH_TIMEOUT = 10
+LIVENEWS_FETCH_BUDGET = 20
+LIVENEWS_FETCH_WORKERS = 8
+
+# Thumbnails missing from a feed are scraped from the article's <head> by at
+# most LIVENEWS_IMAGE_WORKERS parallel requests. Results are cached in the
+# database; pages without an image are retried after the negative TTL.
+LIVENEWS_IMAGE_WORKERS = 6
+LIVENEWS_IMAGE_TIMEOUT = 10
+LIVENEWS_IMAGE_CACHE_TTL = 7 * 24 * 3600
+LIVENEWS_IMAGE_NEGATIVE_CACHE_TTL = 6 * 3600
+
+# All fetchers share one keep-alive HTTP session. Requests that fail to connect,
+# time out or are answered with 429 or 5xx are retried with jittered
+# exponential backoff, honoring Retry-After up to LIVENEWS_HTTP_MAX_RETRY_AFTER
+# seconds. Retries never extend a request past its source's timeout.
+LIVENEWS_HTTP_POOL_CONNECTIONS = 10
+LIVENEWS_HTTP_POOL_MAXSIZE = 10
+LIVENEWS_HTTP_RETRIES = 2
+LIVENEWS_HTTP_BACKOFF_FACTOR = 0.5
+LIVENEWS_HTTP_BACKOFF_JITTER = 0.5
+LIVENEWS_HTTP_MAX_RETRY_AFTER = 10
+
+# Scheduled ingestion runs in its own process: `python manage.py run_ingest`.
+# Only the scheduler holding the database lease fetches; the lease expires
+# after LIVENEWS_LEASE_TTL seconds if its holder dies. Every source runs every
+# LIVENEWS_SOURCE_INTERVALS[name] (default LIVENEWS_DEFAULT_INTERVAL) seconds
+# plus up to LIVENEWS_SCHEDULE_JITTER seconds.
+LIVENEWS_LEASE_TTL = 120
+LIVENEWS_DEFAULT_INTERVAL = 300
+LIVENEWS_SOURCE_INTERVALS = {
+    'altnews': 600,
+}
+LIVENEWS_SCHEDULE_JITTER = 30
+
+# Feed endpoint responses are cached for at most this many seconds
+LIVENEWS_RESPONSE_CACHE_TTL = 60
+
+# Refreshes requested through the API run on a local thread pool. Concurrent
+# requests share the job in flight unless it is older than the timeout.
+LIVENEWS_REFRESH_WORKERS = 2
+LIVENEWS_REFRESH_JOB_TIMEOUT = 300
+
+# Retention: the scheduler moves news published more than
+# LIVENEWS_RETENTION_DAYS days ago into monthly SQLite files under
+# LIVENEWS_ARCHIVE_DIR every LIVENEWS_PRUNE_INTERVAL seconds
+# (`python manage.py prune_livenews` does it on demand). Rows are deleted
+# LIVENEWS_PRUNE_BATCH_SIZE at a time; the database is vacuumed once
+# LIVENEWS_VACUUM_FREE_RATIO of its pages are free. Refresh jobs are kept for
+# LIVENEWS_REFRESH_JOB_RETENTION_DAYS days. The retention metrics served by
+# the API are recomputed at most every LIVENEWS_STATS_CACHE_TTL seconds.
+LIVENEWS_RETENTION_DAYS = 30
+LIVENEWS_ARCHIVE_DIR = os.path.join(BASE_DIR, 'archive')
+LIVENEWS_PRUNE_INTERVAL = 3600
+LIVENEWS_PRUNE_BATCH_SIZE = 500
+LIVENEWS_VACUUM_FREE_RATIO = 0.2
+LIVENEWS_REFRESH_JOB_RETENTION_DAYS = 7
+LIVENEWS_STATS_CACHE_TTL = 300
+
+# Meta model verification cache
+# Search results and verdicts of a claim are reused for the given number of
+# seconds; beyond VERIFY_CACHE_MAX_ENTRIES the least recently used claims are
+# evicted.
+VERIFY_CACHE_SEARCH_TTL = 6 * 3600
+VERIFY_CACHE_VERDICT_TTL = 3600
+VERIFY_CACHE_MAX_ENTRIES = 5000
+
+# Meta model upstreams (Groq, SerpAPI)
+# Connect/read deadlines in seconds and an overall deadline for one
+# verification, plus per-process caps on concurrent calls to each upstream.
+# Calls wait at most META_UPSTREAM_WAIT seconds for a free slot.
+META_CONNECT_TIMEOUT = 5
+META_SEARCH_TIMEOUT = 15
+META_LLM_TIMEOUT = 30
+META_VERIFY_DEADLINE = 60
+META_SEARCH_CONCURRENCY = 8
+META_LLM_CONCURRENCY = 4
+META_UPSTREAM_WAIT = 5
+
+# Batch checks (POST /api/usercheck/title/batch/) accept at most
+# USERCHECK_BATCH_MAX_CLAIMS claims and verify at most
+# USERCHECK_BATCH_META_PARALLELISM of them with the meta model at a time.
+USERCHECK_BATCH_MAX_CLAIMS = 500
+USERCHECK_BATCH_META_PARALLELISM = 4
+
+# News quiz
+# Quiz ids are cached per process and reloaded when quiz news are added or
+# deleted, or at least every NEWSQUIZ_ID_CACHE_TTL seconds. GET /api/quiz/?n=
+# returns at most NEWSQUIZ_MAX_BATCH news.
+NEWSQUIZ_ID_CACHE_TTL = 300
+NEWSQUIZ_MAX_BATCH = 50
+
+# Near-duplicate matching
+# Claims and headlines are compared by Jaccard similarity over word bigrams.
+# A claim matching a verified one, with the same negations and numbers, gets
+# its verdict, so keep that threshold high; syndicated headlines seen within LIVENEWS_HEADLINE_WINDOW seconds are
+# not ingested twice. The in-memory indexes are saved to SIMILARITY_INDEX_DIR
+# at most every SIMILARITY_PERSIST_INTERVAL seconds.
+CLAIM_MATCH_THRESHOLD = 0.7
+LIVENEWS_HEADLINE_MATCH_THRESHOLD = 0.6
+LIVENEWS_HEADLINE_WINDOW = 2 * 24 * 3600
+SIMILARITY_INDEX_DIR = os.path.join(BASE_DIR, 'similarity')
+SIMILARITY_PERSIST_INTERVAL = 300
+
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOW_HEADERS = [
@@ -0,0 +1,57 @@
+"""
+ASGI middleware of the API
+Django 4.2 keeps iterating a streaming response after the client went away,
+so an abandoned stream would run its upstream calls to completion
+"""
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+
+class CancelOnDisconnect:
+    """Cancels the request's handling as soon as the client disconnects.
+
+    The request body is passed through to Django. Once it has been read,
+    the receive channel is watched for `http.disconnect`, and the handling
+    task is cancelled when it arrives, which cancels the awaits in flight,
+    e.g. a streaming Groq request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        body_read = asyncio.Event()
+
+        async def receive_body():
+            message = await receive()
+            if message['type'] != 'http.request' or not message.get('more_body', False):
+                body_read.set()
+            return message
+
+        async def watch_disconnect():
+            await body_read.wait()
+            while True:
+                message = await receive()
+                if message['type'] == 'http.disconnect':
+                    return
+
+        handling = asyncio.ensure_future(self.app(scope, receive_body, send))
+        watcher = asyncio.ensure_future(watch_disconnect())
+        try:
+            await asyncio.wait({handling, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (handling, watcher):
+                task.cancel()
+            await asyncio.gather(handling, watcher, return_exceptions=True)
+
+        if not handling.cancelled() and handling.exception() is not None:
+            raise handling.exception()
+        if handling.cancelled():
+            # The request_finished signal was skipped; release its connections
+            await sync_to_async(close_old_connections, thread_sensitive=True)()
@@ -0,0 +1,58 @@
+"""
+SQLite backend tuned for concurrent ingestion and reads
+Applies pragmas to every new connection, WAL journaling foremost, so readers
+never wait for the ingestion writer, and starts transactions with
+BEGIN IMMEDIATE so concurrent writers queue on the busy timeout instead of
+failing with "database is locked".
+
+Configured through DATABASES['default']['OPTIONS']:
+    'pragmas': overrides of DEFAULT_PRAGMAS, None to leave one unset
+    'transaction_mode': 'DEFERRED', 'IMMEDIATE' (default) or 'EXCLUSIVE'
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',  # Durable with WAL up to the last checkpoint
+    'busy_timeout': 20000,  # Milliseconds
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64000,  # Negative values are KiB
+    'temp_store': 'MEMORY',
+}
+
+TRANSACTION_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        options = dict(self.settings_dict['OPTIONS'])
+        self.pragmas = {**DEFAULT_PRAGMAS, **options.pop('pragmas', {})}
+        self.transaction_mode = options.pop('transaction_mode', 'IMMEDIATE').upper()
+        if self.transaction_mode not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f"transaction_mode must be one of: {', '.join(TRANSACTION_MODES)}"
+            )
+        # The remaining options are passed on to sqlite3.connect()
+        self.connect_options = options
+
+    def get_connection_params(self):
+        settings_dict = self.settings_dict
+        self.settings_dict = {**settings_dict, 'OPTIONS': self.connect_options}
+        try:
+            return super().get_connection_params()
+        finally:
+            self.settings_dict = settings_dict
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            if value is not None:
+                conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute(f'BEGIN {self.transaction_mode}')
@@ -0,0 +1,78 @@
+"""
+Read-through response cache for the live news feed endpoints
+Entries are keyed by a generation counter that ingestion bumps whenever rows
+are added, so a refresh invalidates every cached feed at once
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.http import parse_etags
+
+from rest_framework.response import Response
+from rest_framework import status
+
+GENERATION_KEY = 'livenews:feed-generation'
+
+# Upper bound on staleness when ingestion runs in another process and the
+# cache backend is not shared (e.g. the local-memory default)
+RESPONSE_CACHE_TTL = getattr(settings, 'LIVENEWS_RESPONSE_CACHE_TTL', 60)
+
+
+def get_feed_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, 1, timeout=None)
+        generation = cache.get(GENERATION_KEY, 1)
+    return generation
+
+
+def bump_feed_generation():
+    """Invalidates every cached feed response."""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        # Key missing or evicted: any fresh value works as long as it is new
+        cache.set(GENERATION_KEY, get_feed_generation() + 1, timeout=None)
+
+
+def feed_cache_key(endpoint, **params):
+    parts = '&'.join(f'{name}={params[name]}' for name in sorted(params))
+    return f'livenews:feed:{get_feed_generation()}:{endpoint}:{parts}'
+
+
+def get_cached_feed(endpoint, build, **params):
+    """Returns `(data, etag)` for a feed, calling `build()` on a cache miss.
+
+    `build` must return JSON-serializable data, e.g. serializer data.
+    """
+    key = feed_cache_key(endpoint, **params)
+    entry = cache.get(key)
+    if entry is None:
+        data = build()
+        body = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+        etag = '"%s"' % hashlib.md5(body.encode()).hexdigest()
+        entry = {'data': data, 'etag': etag}
+        cache.set(key, entry, timeout=RESPONSE_CACHE_TTL)
+    return entry['data'], entry['etag']
+
+
+def not_modified(request, etag):
+    """True when the request's `If-None-Match` matches `etag`."""
+    if_none_match = request.headers.get('If-None-Match')
+    if not if_none_match:
+        return False
+    etags = parse_etags(if_none_match)
+    etags = [e[2:] if e.startswith('W/') else e for e in etags]
+    return '*' in etags or etag in etags
+
+
+def cached_feed_response(request, endpoint, build, **params):
+    """Serves a feed from the cache, answering `If-None-Match` with 304."""
+    data, etag = get_cached_feed(endpoint, build, **params)
+    if not_modified(request, etag):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+    return Response(data, status=status.HTTP_200_OK, headers={'ETag': etag})
@@ -0,0 +1,79 @@
+"""
+Collapses syndicated copies of the same story at ingestion time
+The same wire story shows up on Guardian, TOI and Google News under slightly
+different headlines; only the first copy seen within the window is kept
+"""
+
+from datetime import timedelta
+import os
+import re
+import threading
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.similarity import MinHashIndex
+from .models import LiveNews
+
+HEADLINE_MATCH_THRESHOLD = getattr(settings, 'LIVENEWS_HEADLINE_MATCH_THRESHOLD', 0.6)
+HEADLINE_WINDOW = getattr(settings, 'LIVENEWS_HEADLINE_WINDOW', 2 * 24 * 3600)
+SIMILARITY_INDEX_DIR = getattr(
+    settings, 'SIMILARITY_INDEX_DIR', os.path.join(settings.BASE_DIR, 'similarity')
+)
+HEADLINE_INDEX_PATH = os.path.join(SIMILARITY_INDEX_DIR, 'headlines.json')
+
+# Publisher suffix of aggregated headlines, e.g. "... - The Hindu"
+PUBLISHER_SUFFIX = re.compile(r'\s+[-|–]\s+[^-|–]{1,40}$')
+
+_headline_index = None
+_headline_index_lock = threading.Lock()
+
+
+def headline_text(title):
+    """Strips the publisher suffix of a headline."""
+    return PUBLISHER_SUFFIX.sub('', title)
+
+
+def get_headline_index():
+    """Returns the similarity index of recent headlines, keyed on `web_url`.
+
+    It is loaded from its last snapshot, or rebuilt from recent `LiveNews` rows.
+    """
+    global _headline_index
+    if _headline_index is None:
+        with _headline_index_lock:
+            if _headline_index is None:
+                index = MinHashIndex(HEADLINE_MATCH_THRESHOLD, path=HEADLINE_INDEX_PATH)
+                if not index.load():
+                    oldest = timezone.now() - timedelta(seconds=HEADLINE_WINDOW)
+                    recent = LiveNews.objects.filter(publication_date__gte=oldest).order_by('publication_date')
+                    for web_url, title, publication_date in recent.values_list(
+                        'web_url', 'title', 'publication_date'
+                    ):
+                        index.add(web_url, headline_text(title), added_at=publication_date.timestamp())
+                _headline_index = index
+    return _headline_index
+
+
+def collapse_syndicated(articles):
+    """Drops articles whose headline nearly duplicates a recent or earlier one."""
+    index = get_headline_index()
+    batch = MinHashIndex(HEADLINE_MATCH_THRESHOLD)
+    kept = []
+    for article in articles:
+        text = headline_text(article['title'])
+        match = index.query(text, max_age=HEADLINE_WINDOW) or batch.query(text)
+        if match is not None:
+            print(f"Skipping duplicate of {match.key} ({match.similarity:.2f}): {article['title'][:50]}...")
+            continue
+        batch.add(article['web_url'], text)
+        kept.append(article)
+    return kept
+
+
+def remember_headlines(articles):
+    """Adds ingested articles to the headline index."""
+    index = get_headline_index()
+    for article in articles:
+        index.add(article['web_url'], headline_text(article['title']))
+    index.maybe_save()
@@ -0,0 +1,84 @@
+"""
+Conditional fetching of RSS and API feeds
+Sends the validators of the previous fetch and reports unchanged feeds, so the
+sources can skip parsing them
+"""
+
+from contextlib import contextmanager
+import hashlib
+import threading
+
+from django.utils import timezone
+
+from .models import FeedState
+from .http_client import http_get
+
+_local = threading.local()
+
+
+@contextmanager
+def deferred_feed_states():
+    """Makes `fetch_feed` calls of this thread collect the new feed states in
+    the yielded list instead of saving them.
+
+    The caller saves them with `save_feed_states` once the fetched items are
+    stored, so a feed whose items were lost is fully read again next time.
+    """
+    states = []
+    _local.pending = states
+    try:
+        yield states
+    finally:
+        _local.pending = None
+
+
+def save_feed_states(states):
+    for state in states:
+        FeedState.objects.update_or_create(url=state['url'], defaults={
+            name: value for name, value in state.items() if name != 'url'
+        })
+
+
+def fetch_feed(url, timeout):
+    """GETs a feed with `If-None-Match`/`If-Modified-Since` from the last fetch.
+
+    Returns None when the feed is unchanged: either the server answered 304 or
+    the body is byte-identical to the last one (for feeds without validators).
+    Otherwise returns the response; the feed state is only updated on a 200,
+    and only later within `deferred_feed_states()`.
+    """
+    state = FeedState.objects.filter(url=url).first()
+
+    headers = {}
+    if state is not None:
+        if state.etag:
+            headers['If-None-Match'] = state.etag
+        if state.last_modified:
+            headers['If-Modified-Since'] = state.last_modified
+
+    response = http_get(url, timeout, headers=headers)
+
+    if response.status_code == 304:
+        return None
+    if response.status_code != 200:
+        return response
+
+    content_hash = hashlib.sha256(response.content).hexdigest()
+    unchanged = state is not None and state.content_hash == content_hash
+
+    new_state = {
+        'url': url,
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'content_hash': content_hash,
+        'fetched_at': timezone.now(),
+    }
+    pending = getattr(_local, 'pending', None)
+    if pending is None:
+        save_feed_states([new_state])
+    else:
+        pending.append(new_state)
+
+    if unchanged:
+        return None
+    return response
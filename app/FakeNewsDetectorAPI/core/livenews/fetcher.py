@@ -0,0 +1,69 @@
+"""
+Concurrent fetching of live news sources
+All sources of a refresh run at the same time, so a slow source only delays
+itself and the whole refresh is bounded by the slowest source
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .sources import SOURCES, FETCH_TIMEOUT
+from .feeds import deferred_feed_states
+
+# Global budget in seconds for one refresh across all sources
+FETCH_BUDGET = getattr(settings, 'LIVENEWS_FETCH_BUDGET', 20)
+FETCH_WORKERS = getattr(settings, 'LIVENEWS_FETCH_WORKERS', 8)
+
+# Shared pool: sources that overrun the budget keep running in the background
+# until their own per-source timeout fires, without blocking the caller.
+_executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix='livenews-fetch')
+
+
+def _run_source(name, timeout):
+    """Returns the articles of a source and the feed states to save after them."""
+    started = time.perf_counter()
+    try:
+        with deferred_feed_states() as feed_states:
+            articles = SOURCES[name](timeout=timeout)
+        # Sources log and swallow their errors; without articles, keep the old
+        # state so the feed is read in full again
+        return articles, feed_states if articles else []
+    finally:
+        close_old_connections()
+        print(f"Source {name} finished in {time.perf_counter() - started:.2f}s")
+
+
+def fetch_sources(names, timeout=FETCH_TIMEOUT, budget=FETCH_BUDGET):
+    """Fetches the given sources concurrently.
+
+    `timeout` is the deadline passed to every source, `budget` caps the wait for
+    all of them. Sources that fail or miss the budget are skipped, so the
+    returned article list may be partial. Articles keep the order of `names`.
+
+    Returns `(articles, feed_states)`. Save the feed states with
+    `save_feed_states` once the articles are ingested, so skipped or lost
+    articles are fetched again.
+    """
+    futures = {name: _executor.submit(_run_source, name, timeout) for name in names}
+    done, not_done = wait(futures.values(), timeout=budget)
+
+    all_articles = []
+    all_feed_states = []
+    for name, future in futures.items():
+        if future not in done:
+            future.cancel()
+            print(f"Source {name} missed the {budget}s budget, skipping it")
+            continue
+        try:
+            articles, feed_states = future.result()
+        except Exception as e:
+            print(f"Error fetching {name}: {e}")
+            continue
+        print(f"Fetched {len(articles)} articles from {name}")
+        all_articles.extend(articles)
+        all_feed_states.extend(feed_states)
+
+    return all_articles, all_feed_states
@@ -0,0 +1,104 @@
+"""
+Shared HTTP client for the news fetchers
+One pooled `requests.Session` keeps connections alive per host; `http_get`
+retries rate-limited or failing requests with jittered exponential backoff,
+within the caller's deadline
+"""
+
+import random
+import threading
+import time
+
+from django.conf import settings
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+HTTP_POOL_CONNECTIONS = getattr(settings, 'LIVENEWS_HTTP_POOL_CONNECTIONS', 10)
+HTTP_POOL_MAXSIZE = getattr(settings, 'LIVENEWS_HTTP_POOL_MAXSIZE', 10)
+HTTP_RETRIES = getattr(settings, 'LIVENEWS_HTTP_RETRIES', 2)
+HTTP_BACKOFF_FACTOR = getattr(settings, 'LIVENEWS_HTTP_BACKOFF_FACTOR', 0.5)
+HTTP_BACKOFF_JITTER = getattr(settings, 'LIVENEWS_HTTP_BACKOFF_JITTER', 0.5)
+HTTP_MAX_RETRY_AFTER = getattr(settings, 'LIVENEWS_HTTP_MAX_RETRY_AFTER', 10)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def build_session():
+    """Builds a session with keep-alive pools.
+
+    The adapter does not retry: urllib3 would give every attempt the full
+    timeout. `http_get` retries instead, within one overall deadline.
+    """
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+    )
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+
+def retry_delay(attempt, response):
+    """Seconds to wait before retrying: `Retry-After` (capped at
+    HTTP_MAX_RETRY_AFTER) when the server sent one, else jittered backoff."""
+    if response is not None and response.headers.get('Retry-After'):
+        try:
+            return min(Retry().parse_retry_after(response.headers['Retry-After']), HTTP_MAX_RETRY_AFTER)
+        except Exception:
+            pass
+    return HTTP_BACKOFF_FACTOR * 2 ** attempt + random.uniform(0, HTTP_BACKOFF_JITTER)
+
+
+def http_get(url, timeout, **kwargs):
+    """GETs `url` with the shared session, all attempts included within
+    `timeout` seconds.
+
+    Connection errors, timeouts and 429/5xx answers are retried up to
+    HTTP_RETRIES times while the deadline allows for the wait and another
+    attempt; every attempt only gets the time left. The last answer, or
+    error, is returned or raised.
+    """
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    while True:
+        remaining = deadline - time.monotonic()
+        try:
+            response = get_session().get(url, timeout=max(remaining, 0.001), **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            response = None
+            if attempt >= HTTP_RETRIES or time.monotonic() >= deadline:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt >= HTTP_RETRIES:
+                return response
+
+        delay = retry_delay(attempt, response)
+        if time.monotonic() + delay >= deadline:
+            if response is None:
+                raise requests.Timeout(f"No answer from {url} within {timeout}s")
+            return response
+        if response is not None:
+            response.close()
+        time.sleep(delay)
+        attempt += 1
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Returns the process-wide pooled session."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
@@ -0,0 +1,136 @@
+"""
+Image resolution stage for live news
+Finds a thumbnail for new articles whose feed entry did not carry one
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import re
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from bs4 import BeautifulSoup
+
+from .models import ScrapedImage
+from .http_client import http_get
+
+IMAGE_WORKERS = getattr(settings, 'LIVENEWS_IMAGE_WORKERS', 6)
+IMAGE_TIMEOUT = getattr(settings, 'LIVENEWS_IMAGE_TIMEOUT', 10)
+IMAGE_CACHE_TTL = getattr(settings, 'LIVENEWS_IMAGE_CACHE_TTL', 7 * 24 * 3600)
+IMAGE_NEGATIVE_CACHE_TTL = getattr(settings, 'LIVENEWS_IMAGE_NEGATIVE_CACHE_TTL', 6 * 3600)
+
+# Stop reading a page after this many bytes if `</head>` never shows up
+MAX_HEAD_BYTES = 256 * 1024
+HEAD_END = re.compile(rb'</head\s*>', re.IGNORECASE)
+
+
+def read_head(response):
+    """Reads a streamed response up to the end of its `<head>` element."""
+    buffer = b''
+    for chunk in response.iter_content(chunk_size=8192):
+        buffer += chunk
+        match = HEAD_END.search(buffer)
+        if match:
+            return buffer[:match.end()]
+        if len(buffer) >= MAX_HEAD_BYTES:
+            break
+    return buffer
+
+
+def scrap_img_from_head(url, timeout=IMAGE_TIMEOUT):
+    """Scrape the og:image or twitter:image of an article page.
+
+    Only the `<head>` of the page is downloaded and parsed.
+    Returns None when the page has no usable image.
+    """
+    try:
+        with http_get(url, timeout, stream=True) as r:
+            if r.status_code != 200:
+                print(f"Failed to scrape {url}: {r.status_code}")
+                return None
+            head = read_head(r)
+
+        soup = BeautifulSoup(head, 'html.parser')
+
+        # Try og:image meta tag (most reliable), then twitter:image
+        for attrs in ({'property': 'og:image'}, {'name': 'twitter:image'}):
+            meta_img = soup.find('meta', attrs=attrs)
+            if meta_img and meta_img.get('content'):
+                img_url = meta_img['content']
+                if img_url.startswith('http'):
+                    return img_url
+
+        return None
+    except Exception as e:
+        print(f"Error scraping image from {url}: {e}")
+        return None
+
+
+def _scrape(url):
+    try:
+        return scrap_img_from_head(url)
+    finally:
+        close_old_connections()
+
+
+def get_cached_images(urls):
+    """Returns `{page_url: img_url}` for the unexpired cache entries of `urls`."""
+    now = timezone.now()
+    cached = {}
+    for entry in ScrapedImage.objects.filter(page_url__in=urls):
+        ttl = IMAGE_CACHE_TTL if entry.img_url else IMAGE_NEGATIVE_CACHE_TTL
+        if entry.fetched_at + timedelta(seconds=ttl) > now:
+            cached[entry.page_url] = entry.img_url
+    return cached
+
+
+def cache_images(results):
+    """Stores scraped `{page_url: img_url}` results, None meaning no image."""
+    now = timezone.now()
+    ScrapedImage.objects.bulk_create(
+        [ScrapedImage(page_url=url, img_url=img_url, fetched_at=now)
+         for url, img_url in results.items()],
+        update_conflicts=True,
+        unique_fields=['page_url'],
+        update_fields=['img_url', 'fetched_at'],
+    )
+
+
+def resolve_images(articles):
+    """Fills in `img_url` for articles that have none.
+
+    Pages are looked up in the image cache first; the rest are scraped in
+    parallel with at most LIVENEWS_IMAGE_WORKERS requests in flight. Articles
+    that still have no image get their `img_fallback`, or are dropped when
+    they have none. Returns the articles to keep.
+    """
+    missing = list({article['web_url'] for article in articles if not article.get('img_url')})
+
+    if missing:
+        found = get_cached_images(missing)
+        to_scrape = [url for url in missing if url not in found]
+
+        if to_scrape:
+            print(f"Scraping images for {len(to_scrape)} articles...")
+            workers = min(IMAGE_WORKERS, len(to_scrape))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='livenews-image') as executor:
+                scraped = dict(zip(to_scrape, executor.map(_scrape, to_scrape)))
+            try:
+                cache_images(scraped)
+            except Exception as e:
+                print(f"Error caching scraped images: {e}")
+            found.update(scraped)
+    else:
+        found = {}
+
+    resolved = []
+    for article in articles:
+        if not article.get('img_url'):
+            article['img_url'] = found.get(article['web_url']) or article.get('img_fallback')
+        if not article['img_url']:
+            print(f"Skipping article without image: {article['title'][:50]}...")
+            continue
+        resolved.append(article)
+    return resolved
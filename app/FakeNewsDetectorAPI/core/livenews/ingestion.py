@@ -0,0 +1,143 @@
+"""
+Ingestion pipeline for live news
+Turns the article dicts returned by the feed fetchers into `LiveNews` rows
+"""
+
+from django.db import transaction
+
+from .models import LiveNews, has_usable_image, region_for_section
+from .images import resolve_images
+from .duplicates import collapse_syndicated, remember_headlines
+from .cache import bump_feed_generation
+from core.model import predict_titles
+from .source_credibility import assess_article, should_trust_prediction, extract_domain
+
+# Keeps `web_url__in` lookups and inserts well under SQLite's variable limit
+DEDUP_CHUNK_SIZE = 500
+INSERT_BATCH_SIZE = 200
+
+
+def score_articles(articles):
+    """Adds `ml_prediction` and `ml_probability` to every article dict.
+
+    All titles of a fetch cycle are vectorized and scored in a single batch.
+    """
+    scores = predict_titles([article['title'] for article in articles])
+    for article, (prediction, probability) in zip(articles, scores):
+        article['ml_prediction'] = prediction
+        article['ml_probability'] = probability
+    return articles
+
+
+def build_live_news(article_data):
+    """Builds an unsaved `LiveNews` row from a scored article dict."""
+    web_url_ = article_data['web_url']
+    title = article_data['title']
+    ml_prediction_bool = article_data['ml_prediction']
+
+    # Source credibility and fact-check detection, computed once per article
+    assessment = assess_article(web_url_, title)
+    source_credibility = assessment.credibility
+    source_domain = extract_domain(web_url_)
+
+    # Feeds such as AltNews flag fact-checks upfront
+    is_fact_check, verdict = assessment.is_fact_check, assessment.verdict
+    if not is_fact_check and article_data.get('is_fact_check', False):
+        is_fact_check, verdict = True, 'FACT_CHECK'
+
+    # Determine final prediction based on source credibility
+    final_prediction, reasoning = should_trust_prediction(
+        web_url_, title, ml_prediction_bool, assessment=assessment
+    )
+
+    print(f"Article: {title[:50]}...")
+    print(f"  ML Prediction: {ml_prediction_bool}, Source: {source_credibility}")
+    print(f"  Is Fact-Check: {is_fact_check}, Final: {final_prediction}")
+    print(f"  Reasoning: {reasoning}")
+
+    return LiveNews(
+        title=title,
+        publication_date=article_data['publication_date'],
+        news_category=article_data['category'],
+        prediction=final_prediction,  # Use improved prediction
+        section_id=article_data['section_id'],
+        section_name=article_data['section_name'],
+        type=article_data['type'],
+        web_url=web_url_,
+        img_url=article_data['img_url'],
+        has_image=has_usable_image(article_data['img_url']),
+        region=region_for_section(article_data['section_id']),
+        source_credibility=source_credibility,
+        is_fact_check_article=is_fact_check,
+        fact_check_verdict=verdict if is_fact_check else None,
+        source_domain=source_domain,
+        ml_probability=article_data['ml_probability'],
+        ml_confidence=max(article_data['ml_probability'], 1 - article_data['ml_probability'])
+    )
+
+
+def filter_new_articles(all_articles):
+    """Drops articles whose `web_url` is repeated in the batch or already stored.
+
+    Existing URLs are resolved with one `web_url__in` query per chunk.
+    """
+    unique_articles = {}
+    for article_data in all_articles:
+        unique_articles.setdefault(article_data['web_url'], article_data)
+
+    urls = list(unique_articles)
+    existing_urls = set()
+    for i in range(0, len(urls), DEDUP_CHUNK_SIZE):
+        chunk = urls[i:i + DEDUP_CHUNK_SIZE]
+        existing_urls.update(
+            LiveNews.objects.filter(web_url__in=chunk).values_list('web_url', flat=True)
+        )
+
+    return [article for url, article in unique_articles.items() if url not in existing_urls]
+
+
+def ingest_articles(all_articles):
+    """Scores and saves the articles that are not in the database yet.
+
+    Articles with a known URL, or whose headline nearly duplicates a recent
+    story, are dropped. The others are inserted with one `bulk_create` in a
+    single transaction. Rows another refresh inserted meanwhile are skipped
+    thanks to the unique `web_url`, and still counted as added.
+
+    Errors scoring or saving the articles are raised, so callers do not
+    mark their feeds as read.
+    """
+    new_articles = filter_new_articles(all_articles)
+    if new_articles:
+        new_articles = collapse_syndicated(new_articles)
+
+    # Only articles that are actually new get their image resolved
+    if new_articles:
+        new_articles = resolve_images(new_articles)
+
+    if not new_articles:
+        return 0
+
+    score_articles(new_articles)
+
+    news_articles = []
+    for article_data in new_articles:
+        try:
+            news_articles.append(build_live_news(article_data))
+        except Exception as e:
+            print(f"Error preparing article: {e}")
+            continue
+
+    with transaction.atomic():
+        LiveNews.objects.bulk_create(
+            news_articles, batch_size=INSERT_BATCH_SIZE, ignore_conflicts=True
+        )
+
+    # Cached feed responses are stale now
+    bump_feed_generation()
+    remember_headlines(new_articles)
+
+    for news_article in news_articles:
+        print(f"✓ Saved: {news_article.title[:50]}...")
+
+    return len(news_articles)
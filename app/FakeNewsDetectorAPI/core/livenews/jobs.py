@@ -0,0 +1,83 @@
+"""
+Background refresh jobs for the live news API
+Refresh requests are queued on a local thread pool and answered right away;
+concurrent requests for the same sources share one in-flight job
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .models import RefreshJob
+from .sources import REFRESH_SOURCES, INDIA_SOURCES
+from .fetcher import fetch_sources
+from .ingestion import ingest_articles
+from .feeds import save_feed_states
+
+# Sources refreshed by each kind of job
+JOB_SOURCES = {
+    'refresh': REFRESH_SOURCES,
+    'india': INDIA_SOURCES,
+}
+
+REFRESH_WORKERS = getattr(settings, 'LIVENEWS_REFRESH_WORKERS', 2)
+
+# Jobs still unfinished after this many seconds are assumed dead (e.g. their
+# process was restarted) and no longer absorb new requests
+REFRESH_JOB_TIMEOUT = getattr(settings, 'LIVENEWS_REFRESH_JOB_TIMEOUT', 300)
+
+_executor = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix='livenews-refresh')
+_enqueue_lock = threading.Lock()
+
+
+def run_refresh_job(job_id):
+    """Fetches and ingests the sources of a job, recording the outcome."""
+    try:
+        job = RefreshJob.objects.get(id=job_id)
+        job.status = RefreshJob.RUNNING
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'started_at'])
+
+        try:
+            all_articles, feed_states = fetch_sources(JOB_SOURCES[job.kind])
+            job.articles_added = ingest_articles(all_articles)
+            save_feed_states(feed_states)
+            job.status = RefreshJob.SUCCEEDED
+            print(f"✓ Refresh job {job.id} completed: {job.articles_added} new articles")
+        except Exception as e:
+            job.status = RefreshJob.FAILED
+            job.error = str(e)
+            print(f"✗ Refresh job {job.id} failed: {e}")
+
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'articles_added', 'error', 'finished_at'])
+    finally:
+        close_old_connections()
+
+
+def enqueue_refresh(kind):
+    """Queues a refresh of `kind`, or joins the one already in flight.
+
+    Returns `(job, created)`.
+    """
+    if kind not in JOB_SOURCES:
+        raise ValueError(f"Unknown refresh kind: {kind}")
+
+    with _enqueue_lock:
+        cutoff = timezone.now() - timedelta(seconds=REFRESH_JOB_TIMEOUT)
+        in_flight = RefreshJob.objects.filter(
+            kind=kind,
+            status__in=(RefreshJob.QUEUED, RefreshJob.RUNNING),
+            created_at__gte=cutoff,
+        ).order_by('-created_at').first()
+        if in_flight is not None:
+            return in_flight, False
+
+        job = RefreshJob.objects.create(kind=kind)
+
+    _executor.submit(run_refresh_job, job.id)
+    return job, True
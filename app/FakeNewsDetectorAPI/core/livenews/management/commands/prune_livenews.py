@@ -0,0 +1,45 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from core.livenews.retention import (
+    RETENTION_DAYS, PRUNE_BATCH_SIZE, prune_live_news, compact_database, retention_stats
+)
+
+
+class Command(BaseCommand):
+    help = 'Archive live news older than the retention horizon and delete them from the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=RETENTION_DAYS,
+                            help='Keep the news published in the last DAYS days')
+        parser.add_argument('--batch-size', type=int, default=PRUNE_BATCH_SIZE,
+                            help='Delete at most this many rows per transaction')
+        parser.add_argument('--no-archive', action='store_true',
+                            help='Delete expired news without archiving them')
+        parser.add_argument('--vacuum', action='store_true',
+                            help='Vacuum the database even if few pages are free')
+        parser.add_argument('--stats', action='store_true',
+                            help='Only print the retained row counts and sizes')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        if not options['stats']:
+            result = prune_live_news(
+                days=options['days'], batch_size=options['batch_size'],
+                archive=not options['no_archive']
+            )
+            compaction = result.compaction
+            if options['vacuum'] and not (compaction and compaction['vacuumed']):
+                compaction = compact_database(vacuum=True)
+            self.stdout.write(self.style.SUCCESS(
+                f'Archived {result.archived} and deleted {result.deleted} news, '
+                f'deleted {result.jobs_deleted} old refresh jobs'
+            ))
+            if compaction:
+                self.stdout.write(f"Vacuumed: {compaction['vacuumed']}")
+
+        self.stdout.write(json.dumps(retention_stats(), cls=DjangoJSONEncoder, indent=2))
@@ -0,0 +1,40 @@
+import signal
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.livenews.scheduler import IngestScheduler
+from core.livenews.sources import SOURCES
+
+
+class Command(BaseCommand):
+    help = 'Run the live news ingestion scheduler (one leader per deployment)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Fetch and ingest every source once, then exit')
+        parser.add_argument('--source', action='append', dest='sources',
+                            help='Only run this source (repeatable)')
+
+    def handle(self, *args, **options):
+        sources = options['sources']
+        unknown = set(sources or []) - set(SOURCES)
+        if unknown:
+            raise CommandError(f"Unknown sources: {', '.join(sorted(unknown))}")
+
+        scheduler = IngestScheduler(sources=sources)
+
+        if options['once']:
+            articles_added = scheduler.run_once_with_lease()
+            if articles_added is None:
+                raise CommandError('Another ingest scheduler holds the lease, not fetching')
+            self.stdout.write(self.style.SUCCESS(f'Added {articles_added} new articles'))
+            return
+
+        # Let SIGTERM unwind normally so the lease is released on shutdown
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+        try:
+            scheduler.run_forever()
+        except KeyboardInterrupt:
+            self.stdout.write('Ingest scheduler stopped')
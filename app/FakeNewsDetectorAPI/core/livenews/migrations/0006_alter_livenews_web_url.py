@@ -0,0 +1,31 @@
+# Generated by Django 4.2.3 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+def remove_duplicate_web_urls(apps, schema_editor):
+    """Keeps the oldest row for every web_url so the unique index can be built."""
+    LiveNews = apps.get_model('core_livenews', 'LiveNews')
+    duplicated = (
+        LiveNews.objects.values('web_url')
+        .annotate(first_id=models.Min('id'), rows=models.Count('id'))
+        .filter(rows__gt=1)
+    )
+    for row in duplicated:
+        LiveNews.objects.filter(web_url=row['web_url']).exclude(id=row['first_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_livenews', '0005_livenews_fact_check_verdict_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_web_urls, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='livenews',
+            name='web_url',
+            field=models.CharField(max_length=600, unique=True),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.3 on 2026-10-18 02:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_livenews', '0006_alter_livenews_web_url'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScrapedImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('page_url', models.CharField(max_length=600, unique=True)),
+                ('img_url', models.CharField(blank=True, max_length=600, null=True)),
+                ('fetched_at', models.DateTimeField()),
+            ],
+        ),
+    ]
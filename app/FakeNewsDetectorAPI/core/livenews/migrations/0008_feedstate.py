@@ -0,0 +1,24 @@
+# Generated by Django 4.2.3 on 2026-10-18 02:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_livenews', '0007_scrapedimage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.CharField(max_length=600, unique=True)),
+                ('etag', models.CharField(blank=True, max_length=300, null=True)),
+                ('last_modified', models.CharField(blank=True, max_length=100, null=True)),
+                ('content_hash', models.CharField(blank=True, max_length=64, null=True)),
+                ('fetched_at', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.3 on 2026-10-18 02:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_livenews', '0008_feedstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestLease',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('owner', models.CharField(max_length=200)),
+                ('expires_at', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.3 on 2026-10-18 03:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_livenews', '0010_refreshjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='livenews',
+            name='ml_confidence',
+            field=models.FloatField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='livenews',
+            name='ml_probability',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.3 on 2026-10-18 03:10
+
+from django.db import migrations, models
+
+
+def backfill_has_image_and_region(apps, schema_editor):
+    """Derives has_image and region for the rows stored before the fields existed."""
+    LiveNews = apps.get_model('core_livenews', 'LiveNews')
+    LiveNews.objects.filter(img_url__isnull=False).exclude(img_url__in=('', 'None')).update(has_image=True)
+    LiveNews.objects.filter(section_id__icontains='india').update(region='india')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_livenews', '0011_livenews_ml_confidence_livenews_ml_probability'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='livenews',
+            name='has_image',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='livenews',
+            name='region',
+            field=models.CharField(default='global', max_length=20),
+        ),
+        migrations.RunPython(backfill_has_image_and_region, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='livenews',
+            index=models.Index(condition=models.Q(('has_image', True)), fields=['-id'], name='livenews_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='livenews',
+            index=models.Index(condition=models.Q(('has_image', True)), fields=['news_category', '-id'], name='livenews_category_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='livenews',
+            index=models.Index(condition=models.Q(('has_image', True)), fields=['region', '-id'], name='livenews_region_feed_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.3 on 2026-10-18 03:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_livenews', '0012_livenews_has_image_region'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='livenews',
+            name='publication_date',
+            field=models.DateTimeField(db_index=True),
+        ),
+    ]
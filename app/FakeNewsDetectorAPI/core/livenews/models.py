@@ -1,17 +1,31 @@
 from django.db import models
+import uuid
+
+REGION_INDIA = 'india'
+REGION_GLOBAL = 'global'
+
+
+def has_usable_image(img_url):
+    """False for missing images, including the literal 'None' older rows stored."""
+    return bool(img_url) and img_url != 'None'
+
+
+def region_for_section(section_id):
+    """Normalizes a feed section into the region the feeds filter on."""
+    return REGION_INDIA if 'india' in (section_id or '').lower() else REGION_GLOBAL
 
 
 class LiveNews(models.Model):
     """Creates model to store news get from an API
     and predicts in real life."""
     title = models.CharField(max_length=2000)
-    publication_date = models.DateTimeField()
+    publication_date = models.DateTimeField(db_index=True)  # Retention prunes by age
     news_category = models.CharField(max_length=200)
     prediction = models.BooleanField(default=True)
     section_id = models.CharField(max_length=200)
     section_name = models.CharField(max_length=200)
     type = models.CharField(max_length=200)
-    web_url = models.CharField(max_length=600)
+    web_url = models.CharField(max_length=600, unique=True)
     img_url = models.CharField(max_length=600)
     
     # New fields for better fact-checking
@@ -20,5 +34,95 @@ class LiveNews(models.Model):
     fact_check_verdict = models.CharField(max_length=100, blank=True, null=True)  # For fact-check articles
     source_domain = models.CharField(max_length=300, blank=True, null=True)  # Extract domain from URL
 
+    # Raw NB model scores of the title, before source credibility adjustments
+    ml_probability = models.FloatField(blank=True, null=True)  # Probability of being real
+    ml_confidence = models.FloatField(blank=True, null=True, db_index=True)  # Probability of the ML prediction
+
+    # Derived from img_url and section_id so the feeds filter on indexed columns
+    has_image = models.BooleanField(default=False)
+    region = models.CharField(max_length=20, default=REGION_GLOBAL)
+
+    class Meta:
+        # One index per feed query, ending in -id for keyset pagination. Partial
+        # on has_image, as the feeds only ever read rows with an image.
+        indexes = [
+            models.Index(fields=['-id'], condition=models.Q(has_image=True), name='livenews_feed_idx'),
+            models.Index(
+                fields=['news_category', '-id'], condition=models.Q(has_image=True),
+                name='livenews_category_feed_idx'
+            ),
+            models.Index(
+                fields=['region', '-id'], condition=models.Q(has_image=True),
+                name='livenews_region_feed_idx'
+            ),
+        ]
+
     def __str__(self):
         return self.title
+
+    def save(self, *args, **kwargs):
+        self.has_image = has_usable_image(self.img_url)
+        self.region = region_for_section(self.section_id)
+        super().save(*args, **kwargs)
+
+
+class ScrapedImage(models.Model):
+    """Caches the image scraped from an article page.
+
+    `img_url` is empty when the page had no usable image, so failed pages are
+    not scraped again until the negative entry expires."""
+    page_url = models.CharField(max_length=600, unique=True)
+    img_url = models.CharField(max_length=600, blank=True, null=True)
+    fetched_at = models.DateTimeField()
+
+    def __str__(self):
+        return self.page_url
+
+
+class FeedState(models.Model):
+    """Remembers the validators and body hash of the last fetch of a feed URL,
+    so unchanged feeds can be skipped without parsing them."""
+    url = models.CharField(max_length=600, unique=True)
+    etag = models.CharField(max_length=300, blank=True, null=True)
+    last_modified = models.CharField(max_length=100, blank=True, null=True)
+    content_hash = models.CharField(max_length=64, blank=True, null=True)
+    fetched_at = models.DateTimeField()
+
+    def __str__(self):
+        return self.url
+
+
+class IngestLease(models.Model):
+    """A named lease held by one ingestion scheduler at a time."""
+    name = models.CharField(max_length=100, unique=True)
+    owner = models.CharField(max_length=200)
+    expires_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} ({self.owner})"
+
+
+class RefreshJob(models.Model):
+    """A background refresh of the live news sources requested through the API."""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (SUCCEEDED, 'Succeeded'),
+        (FAILED, 'Failed'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=50)  # Which group of sources to refresh
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=QUEUED)
+    articles_added = models.IntegerField(blank=True, null=True)
+    error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.kind} refresh {self.id} ({self.status})"
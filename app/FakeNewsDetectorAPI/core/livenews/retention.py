@@ -0,0 +1,237 @@
+"""
+Retention for live news
+Rows older than the retention horizon are copied into monthly SQLite archive
+files and deleted from the hot table in small batches, so ingestion is never
+locked out for long. The database is analyzed, and vacuumed once enough pages
+are free, after every prune that deleted rows. Old refresh jobs are deleted
+in the same pass.
+"""
+
+from collections import defaultdict, namedtuple
+from contextlib import closing
+from datetime import date, datetime, timedelta
+import glob
+import os
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from .models import LiveNews, RefreshJob
+from .cache import bump_feed_generation
+
+RETENTION_DAYS = getattr(settings, 'LIVENEWS_RETENTION_DAYS', 30)
+ARCHIVE_DIR = getattr(settings, 'LIVENEWS_ARCHIVE_DIR', os.path.join(settings.BASE_DIR, 'archive'))
+PRUNE_BATCH_SIZE = getattr(settings, 'LIVENEWS_PRUNE_BATCH_SIZE', 500)
+PRUNE_BATCH_PAUSE = getattr(settings, 'LIVENEWS_PRUNE_BATCH_PAUSE', 0.1)
+VACUUM_FREE_RATIO = getattr(settings, 'LIVENEWS_VACUUM_FREE_RATIO', 0.2)
+REFRESH_JOB_RETENTION_DAYS = getattr(settings, 'LIVENEWS_REFRESH_JOB_RETENTION_DAYS', 7)
+STATS_CACHE_TTL = getattr(settings, 'LIVENEWS_STATS_CACHE_TTL', 300)
+
+STATS_KEY = 'livenews:retention-stats'
+
+ARCHIVE_TABLE = 'livenews'
+
+PruneResult = namedtuple('PruneResult', ['archived', 'deleted', 'jobs_deleted', 'compaction'])
+
+
+def archive_columns():
+    return [field.attname for field in LiveNews._meta.concrete_fields]
+
+
+def archive_path(month):
+    """Path of the archive file of `month` ('YYYY-MM')."""
+    return os.path.join(ARCHIVE_DIR, f'livenews-{month}.sqlite3')
+
+
+def open_archive(path):
+    columns = archive_columns()
+    conn = sqlite3.connect(path)
+    # Untyped columns: SQLite stores each value with its own storage class
+    definitions = ', '.join(
+        f'{column} INTEGER PRIMARY KEY' if column == 'id' else column for column in columns
+    )
+    conn.execute(f'CREATE TABLE IF NOT EXISTS {ARCHIVE_TABLE} ({definitions})')
+    return conn
+
+
+def archive_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def archive_rows(rows):
+    """Appends `LiveNews` value dicts to the archive file of their month.
+
+    Rows are keyed by id, so archiving a row twice (e.g. after an interrupted
+    prune) keeps a single copy. Returns the number of rows written.
+    """
+    columns = archive_columns()
+    by_month = defaultdict(list)
+    for row in rows:
+        month = row['publication_date'].strftime('%Y-%m')
+        by_month[month].append(tuple(archive_value(row[column]) for column in columns))
+
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    placeholders = ', '.join('?' for _ in columns)
+    for month, values in by_month.items():
+        with closing(open_archive(archive_path(month))) as conn:
+            with conn:
+                conn.executemany(
+                    f'INSERT OR REPLACE INTO {ARCHIVE_TABLE} ({", ".join(columns)}) VALUES ({placeholders})',
+                    values
+                )
+    return sum(len(values) for values in by_month.values())
+
+
+def prune_refresh_jobs(days=REFRESH_JOB_RETENTION_DAYS):
+    """Deletes the refresh jobs created more than `days` days ago.
+
+    Jobs still queued or running by then belong to a process that died.
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    return RefreshJob.objects.filter(created_at__lt=cutoff).delete()[0]
+
+
+def prune_live_news(days=RETENTION_DAYS, batch_size=PRUNE_BATCH_SIZE, archive=True,
+                    pause=PRUNE_BATCH_PAUSE, job_days=REFRESH_JOB_RETENTION_DAYS):
+    """Archives and deletes the news published more than `days` days ago, and
+    the refresh jobs older than `job_days` days.
+
+    Every batch of at most `batch_size` rows is deleted in its own short
+    transaction, pausing `pause` seconds in between to let writers in.
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, not {batch_size}")
+    cutoff = timezone.now() - timedelta(days=days)
+    expired = LiveNews.objects.filter(publication_date__lt=cutoff).order_by('publication_date', 'id')
+    columns = archive_columns()
+
+    archived = deleted = 0
+    while True:
+        rows = list(expired.values(*columns)[:batch_size])
+        if not rows:
+            break
+        if archive:
+            archived += archive_rows(rows)
+        with transaction.atomic():
+            deleted += LiveNews.objects.filter(id__in=[row['id'] for row in rows]).delete()[0]
+        print(f"Pruned {deleted} live news older than {cutoff:%Y-%m-%d}")
+        if len(rows) < batch_size:
+            break
+        time.sleep(pause)
+
+    jobs_deleted = prune_refresh_jobs(job_days)
+
+    compaction = None
+    if deleted:
+        # Cached feeds may list the deleted rows
+        bump_feed_generation()
+        compaction = compact_database()
+    cache.delete(STATS_KEY)
+    return PruneResult(archived, deleted, jobs_deleted, compaction)
+
+
+def sqlite_pages(cursor):
+    cursor.execute('PRAGMA page_count')
+    page_count = cursor.fetchone()[0]
+    cursor.execute('PRAGMA freelist_count')
+    free_pages = cursor.fetchone()[0]
+    cursor.execute('PRAGMA page_size')
+    return page_count, free_pages, cursor.fetchone()[0]
+
+
+def compact_database(vacuum=None):
+    """Refreshes the planner statistics of the `LiveNews` table and reclaims
+    free space.
+
+    On SQLite, the file is vacuumed when `vacuum` is True, or by default once
+    at least VACUUM_FREE_RATIO of its pages are free. PostgreSQL tables are
+    vacuumed in place.
+    """
+    table = connection.ops.quote_name(LiveNews._meta.db_table)
+    vacuumed = False
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'ANALYZE {table}')
+            page_count, free_pages, _ = sqlite_pages(cursor)
+            if vacuum is None:
+                vacuum = page_count and free_pages / page_count >= VACUUM_FREE_RATIO
+            if vacuum:
+                cursor.execute('VACUUM')
+                vacuumed = True
+        elif connection.vendor == 'postgresql':
+            cursor.execute(f'VACUUM ANALYZE {table}' if vacuum is not False else f'ANALYZE {table}')
+            vacuumed = vacuum is not False
+        else:
+            cursor.execute(f'ANALYZE TABLE {table}')
+    return {'analyzed': True, 'vacuumed': vacuumed}
+
+
+def hot_table_bytes(cursor):
+    """Size of the `LiveNews` table with its indexes, or None when unknown."""
+    table = LiveNews._meta.db_table
+    try:
+        if connection.vendor == 'sqlite':
+            # Needs SQLite built with the dbstat virtual table
+            cursor.execute(
+                'SELECT SUM(pgsize) FROM dbstat WHERE name = %s OR name IN '
+                '(SELECT name FROM sqlite_master WHERE type = %s AND tbl_name = %s)',
+                [table, 'index', table]
+            )
+            return cursor.fetchone()[0]
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT pg_total_relation_size(%s)', [table])
+            return cursor.fetchone()[0]
+    except Exception:
+        pass
+    return None
+
+
+def retention_stats():
+    """Row counts and sizes of the hot table and of the archive."""
+    hot = LiveNews.objects.aggregate(
+        oldest=Min('publication_date'), newest=Max('publication_date')
+    )
+    hot['rows'] = LiveNews.objects.count()
+    with connection.cursor() as cursor:
+        hot['table_bytes'] = hot_table_bytes(cursor)
+        if connection.vendor == 'sqlite':
+            page_count, free_pages, page_size = sqlite_pages(cursor)
+            hot['database_bytes'] = page_count * page_size
+            hot['free_bytes'] = free_pages * page_size
+
+    months = []
+    for path in sorted(glob.glob(archive_path('*'))):
+        with closing(sqlite3.connect(path)) as conn:
+            rows = conn.execute(f'SELECT COUNT(*) FROM {ARCHIVE_TABLE}').fetchone()[0]
+        month = os.path.basename(path)[len('livenews-'):-len('.sqlite3')]
+        months.append({'month': month, 'rows': rows, 'bytes': os.path.getsize(path)})
+
+    return {
+        'retention_days': RETENTION_DAYS,
+        'hot': hot,
+        'archive': {
+            'rows': sum(month['rows'] for month in months),
+            'bytes': sum(month['bytes'] for month in months),
+            'months': months,
+        },
+    }
+
+
+def get_retention_stats():
+    """`retention_stats()`, cached for STATS_CACHE_TTL seconds.
+
+    Counting the rows and sizing the tables reads the whole database, so it
+    is not repeated for every request.
+    """
+    stats = cache.get(STATS_KEY)
+    if stats is None:
+        stats = retention_stats()
+        cache.set(STATS_KEY, stats, timeout=STATS_CACHE_TTL)
+    return stats
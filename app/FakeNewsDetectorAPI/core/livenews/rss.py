@@ -0,0 +1,109 @@
+"""
+Streaming RSS parser shared by the RSS news sources
+Items are read incrementally with lxml and every item is turned into a flat
+dict in a single pass over its children
+"""
+
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from io import BytesIO
+import re
+
+from lxml import etree
+
+MEDIA_CONTENT = '{http://search.yahoo.com/mrss/}content'
+CONTENT_ENCODED = '{http://purl.org/rss/1.0/modules/content/}encoded'
+
+IMG_TAG = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+IMG_ATTR = re.compile(r'''\b(src|data-src)\s*=\s*["']([^"']+)["']''', re.IGNORECASE)
+
+
+def parse_pub_date(pub_date):
+    """Converts an RFC 822 date to ISO format, defaulting to now."""
+    if pub_date:
+        try:
+            return parsedate_to_datetime(pub_date).isoformat()
+        except (TypeError, ValueError):
+            pass
+    return datetime.now().isoformat()
+
+
+def first_img_src(html):
+    """Returns the `src` (or `data-src`) of the first `<img>` in an HTML snippet."""
+    if not html:
+        return None
+    img_tag = IMG_TAG.search(html)
+    if not img_tag:
+        return None
+    attrs = {}
+    for name, value in IMG_ATTR.findall(img_tag.group(0)):
+        attrs.setdefault(name.lower(), value)
+    img_src = attrs.get('src') or attrs.get('data-src')
+    if img_src and img_src.startswith('http'):
+        return img_src
+    return None
+
+
+def _text(element):
+    return (element.text or '').strip() or None
+
+
+def _parse_item(item):
+    parsed = {
+        'title': None,
+        'link': None,
+        'publication_date': None,
+        'category': None,
+        'enclosure_url': None,
+        'media_url': None,
+        'description_img': None,
+        'content_img': None,
+    }
+    for child in item:
+        tag = child.tag
+        if tag == 'title':
+            parsed['title'] = _text(child)
+        elif tag == 'link':
+            parsed['link'] = _text(child)
+        elif tag == 'pubDate':
+            parsed['publication_date'] = _text(child)
+        elif tag == 'category':
+            parsed['category'] = parsed['category'] or _text(child)
+        elif tag == 'enclosure':
+            parsed['enclosure_url'] = parsed['enclosure_url'] or child.get('url')
+        elif tag == MEDIA_CONTENT:
+            parsed['media_url'] = parsed['media_url'] or child.get('url')
+        elif tag == 'description':
+            parsed['description_img'] = first_img_src(child.text)
+        elif tag == CONTENT_ENCODED:
+            parsed['content_img'] = first_img_src(child.text)
+    parsed['publication_date'] = parse_pub_date(parsed['publication_date'])
+    return parsed
+
+
+def parse_feed_items(content, limit):
+    """Yields up to `limit` items of an RSS document as dicts.
+
+    Every dict has `title`, `link`, `publication_date` (ISO format),
+    `category`, `enclosure_url`, `media_url` and the first image found in
+    `description` and `content:encoded` (`description_img`, `content_img`).
+    Parsing stops as soon as `limit` items have been read.
+    """
+    if limit <= 0:
+        return
+    items = etree.iterparse(
+        BytesIO(content), events=('end',), tag='item',
+        recover=True, resolve_entities=False, no_network=True,
+    )
+    count = 0
+    for _, item in items:
+        yield _parse_item(item)
+
+        # Free the parsed item and the ones before it
+        item.clear()
+        while item.getprevious() is not None:
+            del item.getparent()[0]
+
+        count += 1
+        if count >= limit:
+            return
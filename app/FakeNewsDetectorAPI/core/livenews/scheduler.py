@@ -0,0 +1,204 @@
+"""
+Ingestion scheduler for live news
+Runs every source on its own interval in a dedicated process. A database lease
+makes sure only one scheduler per deployment fetches at a time.
+"""
+
+from datetime import timedelta
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connection
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import IngestLease
+from .sources import SOURCES
+from .fetcher import fetch_sources
+from .ingestion import ingest_articles
+from .feeds import save_feed_states
+from .retention import PRUNE_BATCH_SIZE, prune_live_news
+
+LEASE_NAME = 'livenews-ingest'
+LEASE_TTL = getattr(settings, 'LIVENEWS_LEASE_TTL', 120)
+DEFAULT_INTERVAL = getattr(settings, 'LIVENEWS_DEFAULT_INTERVAL', 300)
+SOURCE_INTERVALS = getattr(settings, 'LIVENEWS_SOURCE_INTERVALS', {})
+SCHEDULE_JITTER = getattr(settings, 'LIVENEWS_SCHEDULE_JITTER', 30)
+PRUNE_INTERVAL = getattr(settings, 'LIVENEWS_PRUNE_INTERVAL', 3600)
+
+
+def acquire_lease(name, owner, ttl):
+    """Takes or renews the lease `name` for `owner` for `ttl` seconds.
+
+    Returns True when `owner` holds the lease afterwards.
+    """
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=ttl)
+    taken = IngestLease.objects.filter(
+        Q(expires_at__lt=now) | Q(owner=owner), name=name
+    ).update(owner=owner, expires_at=expires_at)
+    if taken:
+        return True
+    try:
+        IngestLease.objects.create(name=name, owner=owner, expires_at=expires_at)
+        return True
+    except IntegrityError:
+        # Someone else holds an unexpired lease
+        return False
+
+
+def release_lease(name, owner):
+    """Gives up the lease `name` if `owner` holds it."""
+    IngestLease.objects.filter(name=name, owner=owner).delete()
+
+
+class LeaseHeartbeat:
+    """Keeps renewing a lease from a background thread while a long step runs.
+
+    The lease must be held on entry. `held()` turns False once a renewal
+    finds another owner, or no renewal succeeded for a whole TTL, e.g. while
+    the database was locked by a vacuum.
+    """
+
+    def __init__(self, name, owner, ttl):
+        self.name = name
+        self.owner = owner
+        self.ttl = ttl
+        self._stop = threading.Event()
+        self._thread = None
+        self._renewed_at = 0.0
+        self._lost = False
+
+    def held(self):
+        return not self._lost and time.monotonic() - self._renewed_at < self.ttl
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self.ttl / 3):
+                try:
+                    renewed = acquire_lease(self.name, self.owner, self.ttl)
+                except Exception as e:
+                    print(f"Error renewing lease {self.name}: {e}")
+                    continue
+                if not renewed:
+                    print(f"Lease {self.name} taken over by another scheduler")
+                    self._lost = True
+                    return
+                self._renewed_at = time.monotonic()
+        finally:
+            # This thread has its own database connection
+            connection.close()
+
+    def __enter__(self):
+        self._renewed_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name=f'lease-{self.name}', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+class IngestScheduler:
+    """Fetches and ingests every source on its own interval, with jitter.
+
+    Every `prune_interval` seconds, expired news are archived and pruned too.
+    """
+
+    def __init__(self, sources=None, lease_ttl=LEASE_TTL, jitter=SCHEDULE_JITTER,
+                 prune_interval=PRUNE_INTERVAL):
+        self.sources = list(sources or SOURCES)
+        self.lease_ttl = lease_ttl
+        self.jitter = jitter
+        self.prune_interval = prune_interval
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.next_run = {name: 0.0 for name in self.sources}
+        self.next_prune = 0.0
+
+    def interval(self, name):
+        return SOURCE_INTERVALS.get(name, DEFAULT_INTERVAL)
+
+    def due_sources(self, now):
+        return [name for name in self.sources if self.next_run[name] <= now]
+
+    def run_once(self, names=None, lease=None):
+        """Fetches and ingests `names` (default: all sources) right now.
+
+        Nothing is written if the `LeaseHeartbeat` `lease` was lost while fetching.
+        """
+        names = names or self.sources
+        all_articles, feed_states = fetch_sources(names)
+        if lease is not None and not lease.held():
+            print(f"Lost lease {LEASE_NAME}, discarding the articles fetched from {names}")
+            return 0
+        articles_added = ingest_articles(all_articles)
+        save_feed_states(feed_states)
+
+        now = time.monotonic()
+        for name in names:
+            self.next_run[name] = now + self.interval(name) + random.uniform(0, self.jitter)
+
+        print(f"Ingested {names}: {articles_added} new articles")
+        return articles_added
+
+    def run_once_with_lease(self, names=None):
+        """Runs `run_once` while holding the lease.
+
+        Returns None without fetching when another scheduler holds it.
+        """
+        if not acquire_lease(LEASE_NAME, self.owner, self.lease_ttl):
+            return None
+        try:
+            with LeaseHeartbeat(LEASE_NAME, self.owner, self.lease_ttl) as lease:
+                return self.run_once(names, lease=lease)
+        finally:
+            release_lease(LEASE_NAME, self.owner)
+
+    def prune(self):
+        """Archives and deletes expired news, then schedules the next prune."""
+        self.next_prune = time.monotonic() + self.prune_interval
+        if PRUNE_BATCH_SIZE < 1:
+            raise ValueError(f"LIVENEWS_PRUNE_BATCH_SIZE must be at least 1, not {PRUNE_BATCH_SIZE}")
+        result = prune_live_news(batch_size=PRUNE_BATCH_SIZE)
+        print(f"Pruned live news: {result.archived} archived, {result.deleted} deleted, "
+              f"{result.jobs_deleted} refresh jobs deleted")
+        return result
+
+    def run_forever(self):
+        """Runs due sources while holding the lease, until interrupted."""
+        print(f"Ingest scheduler {self.owner} started for {self.sources}")
+        try:
+            while True:
+                close_old_connections()
+                if not acquire_lease(LEASE_NAME, self.owner, self.lease_ttl):
+                    # Another scheduler is the leader; check again later
+                    print(f"Lease {LEASE_NAME} held by another scheduler, waiting")
+                    time.sleep(self.lease_ttl / 2)
+                    continue
+
+                # Ingestion and pruning can outlast the lease TTL
+                with LeaseHeartbeat(LEASE_NAME, self.owner, self.lease_ttl) as lease:
+                    due = self.due_sources(time.monotonic())
+                    if due:
+                        try:
+                            self.run_once(due, lease=lease)
+                        except Exception as e:
+                            print(f"Error in scheduled ingestion: {e}")
+
+                    if self.next_prune <= time.monotonic() and lease.held():
+                        try:
+                            self.prune()
+                        except Exception as e:
+                            print(f"Error in scheduled pruning: {e}")
+
+                # Wake up for the next due source, but early enough to renew the lease
+                wait = min(self.next_prune, *self.next_run.values()) - time.monotonic()
+                time.sleep(max(1.0, min(wait, self.lease_ttl / 3)))
+        finally:
+            release_lease(LEASE_NAME, self.owner)
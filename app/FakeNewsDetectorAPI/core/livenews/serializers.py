@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import LiveNews
+from .models import LiveNews, RefreshJob
 
 
 class LiveNewsSerializer(serializers.ModelSerializer):
@@ -10,6 +10,7 @@ class LiveNewsSerializer(serializers.ModelSerializer):
                     'id', 'title', 'publication_date',
                     'news_category', 'prediction', 'img_url',
                     'source_credibility', 'is_fact_check_article',
+                    'ml_probability', 'ml_confidence',
                  )
 
 
@@ -22,5 +23,17 @@ class LiveNewsDetailedSerializer(serializers.ModelSerializer):
                     'news_category', 'prediction', 'section_id',
                     'section_name', 'type', 'web_url', 'img_url',
                     'source_credibility', 'is_fact_check_article', 
-                    'fact_check_verdict', 'source_domain'
+                    'fact_check_verdict', 'source_domain',
+                    'ml_probability', 'ml_confidence'
+                 )
+
+
+
+class RefreshJobSerializer(serializers.ModelSerializer):
+    """Serializes the state of a background refresh job"""
+    class Meta:
+        model = RefreshJob
+        fields = (
+                    'id', 'kind', 'status', 'articles_added', 'error',
+                    'created_at', 'started_at', 'finished_at',
                  )
@@ -3,6 +3,9 @@ Source credibility checker for news verification
 Determines the reliability of news sources and identifies fact-checking sites
 """
 
+from collections import namedtuple
+from functools import lru_cache
+import re
 from urllib.parse import urlparse
 
 
@@ -51,6 +54,93 @@ MEDIUM_CREDIBILITY_SOURCES = {
     'onmanorama.com': 'Onmanorama',
 }
 
+# Credibility tiers in priority order: a URL matching several tables gets the first
+CREDIBILITY_TIERS = (
+    ('FACT_CHECKER', FACT_CHECKING_SOURCES),
+    ('HIGH', HIGH_CREDIBILITY_SOURCES),
+    ('MEDIUM', MEDIUM_CREDIBILITY_SOURCES),
+)
+
+# Result of a source lookup; `fact_check_source` is only set for fact-checkers
+SourceInfo = namedtuple('SourceInfo', ['credibility', 'fact_check_source', 'name'])
+
+UNKNOWN_SOURCE = SourceInfo('UNKNOWN', None, None)
+
+_ENTRIES = ''  # Node key holding the entries of a trie node; never a domain label
+
+
+def _build_domain_index():
+    """Builds a trie over reversed domain labels from the source tables.
+
+    `thequint.com/news/webqoof` is stored under com -> thequint with the path
+    prefix `/news/webqoof`; plain domains have an empty path prefix.
+    """
+    root = {}
+    for rank, (credibility, sources) in enumerate(CREDIBILITY_TIERS):
+        for entry, name in sources.items():
+            host, _, path = entry.partition('/')
+            node = root
+            for label in reversed(host.split('.')):
+                node = node.setdefault(label, {})
+            path_prefix = f'/{path}' if path else ''
+            node.setdefault(_ENTRIES, []).append((rank, path_prefix, credibility, name))
+    return root
+
+
+_DOMAIN_INDEX = _build_domain_index()
+
+
+def _best_entry(entries):
+    """Picks the entry of the highest tier, preferring the longest path prefix."""
+    rank, _, credibility, name = min(entries, key=lambda e: (e[0], -len(e[1])))
+    return SourceInfo(credibility, name if credibility == 'FACT_CHECKER' else None, name)
+
+
+@lru_cache(maxsize=4096)
+def _lookup_host(host):
+    """Collects the table entries that are a suffix of `host` on a label boundary.
+
+    Returns `(host_match, host_entries, path_entries)`, where `host_match` is
+    the result for URLs not covered by a path-scoped entry.
+    """
+    node = _DOMAIN_INDEX
+    host_entries = []
+    path_entries = []
+    for label in reversed(host.split('.')):
+        node = node.get(label)
+        if node is None:
+            break
+        for entry in node.get(_ENTRIES, ()):
+            (path_entries if entry[1] else host_entries).append(entry)
+    host_match = _best_entry(host_entries) if host_entries else UNKNOWN_SOURCE
+    return host_match, tuple(host_entries), tuple(path_entries)
+
+
+def lookup_source(url):
+    """Returns the `SourceInfo` (credibility, fact-check source, display name)
+    of a URL in one pass over its domain labels."""
+    try:
+        parsed = urlparse(url.lower())
+        host = parsed.hostname
+    except (AttributeError, ValueError):
+        return UNKNOWN_SOURCE
+    if not host:
+        return UNKNOWN_SOURCE
+
+    host_match, host_entries, path_entries = _lookup_host(host)
+    if not path_entries:
+        return host_match
+
+    path = parsed.path
+    matching_paths = tuple(
+        entry for entry in path_entries
+        if path == entry[1] or path.startswith(entry[1] + '/')
+    )
+    if not matching_paths:
+        return host_match
+    return _best_entry(host_entries + matching_paths)
+
+
 def extract_domain(url):
     """Extract domain from URL"""
     try:
@@ -64,53 +154,115 @@ def extract_domain(url):
         return None
 
 
+# Title keywords marking an article as a fact-check
+FACT_CHECK_KEYWORDS = (
+    'fact check', 'fact-check', 'factcheck',
+    'debunk', 'debunked', 'debunking',
+    'fake news', 'misleading', 'false claim',
+    'misinformation', 'disinformation',
+    'fact checked', 'claim check', 'truth check',
+    'viral claim', 'fake', 'hoax',
+)
+
+# Title words hinting at a fact-check verdict, in priority order
+VERDICT_KEYWORDS = (
+    ('FALSE', ('false', 'fake', 'hoax', 'misleading', 'fabricated')),
+    ('TRUE', ('true', 'verified', 'confirmed', 'correct')),
+    ('PARTIALLY_TRUE', ('partially', 'partly', 'mixed', 'incomplete')),
+)
+
+FACT_CHECK = 'FACT_CHECK'
+
+# Result of classifying a title: every keyword hit plus what they imply
+TitleMatch = namedtuple('TitleMatch', ['hits', 'is_fact_check', 'verdict'])
+
+# Per-article credibility assessment shared by ingestion and the meta verifier
+CredibilityResult = namedtuple('CredibilityResult', [
+    'credibility', 'source_name', 'is_fact_check', 'fact_check_source', 'verdict', 'hits',
+])
+
+
+def _build_keyword_matcher():
+    """Compiles every title keyword into one word-bounded alternation.
+
+    Alternatives are tried longest first, so "fake news" wins over "fake" at the
+    same position. Each keyword also carries the categories of the keywords it
+    contains ("fake news" implies the FALSE verdict of "fake"), since the
+    regex only reports the longest match at a position.
+    """
+    categories = {}
+    for keyword in FACT_CHECK_KEYWORDS:
+        categories.setdefault(keyword, set()).add(FACT_CHECK)
+    for verdict, keywords in VERDICT_KEYWORDS:
+        for keyword in keywords:
+            categories.setdefault(keyword, set()).add(verdict)
+
+    keywords = sorted(categories, key=len, reverse=True)
+    for keyword in keywords:
+        for other in keywords:
+            if other != keyword and re.search(r'\b%s\b' % re.escape(other), keyword):
+                categories[keyword] |= categories[other]
+
+    pattern = re.compile(
+        r'\b(?:%s)\b' % '|'.join(re.escape(keyword) for keyword in keywords),
+        re.IGNORECASE,
+    )
+    return pattern, {keyword: frozenset(cats) for keyword, cats in categories.items()}
+
+
+_KEYWORD_PATTERN, _KEYWORD_CATEGORIES = _build_keyword_matcher()
+
+
+def classify_title(title):
+    """Finds all fact-check and verdict keywords of a title in a single pass.
+
+    The verdict is the highest priority one hinted at by the title, or
+    `FACT_CHECK` when there is none.
+    """
+    hits = tuple(match.group(0).lower() for match in _KEYWORD_PATTERN.finditer(title or ''))
+    found = set()
+    for hit in hits:
+        found |= _KEYWORD_CATEGORIES[hit]
+
+    verdict = next((v for v, _ in VERDICT_KEYWORDS if v in found), FACT_CHECK)
+    return TitleMatch(hits, FACT_CHECK in found, verdict)
+
+
+def assess_article(url, title):
+    """Computes the `CredibilityResult` of an article from its URL and title."""
+    source = lookup_source(url)
+    match = classify_title(title)
+
+    if source.fact_check_source:
+        fact_check_source = source.fact_check_source
+    elif match.is_fact_check:
+        fact_check_source = 'Unknown Fact Checker'
+    else:
+        fact_check_source = None
+
+    is_fact_check = fact_check_source is not None
+    return CredibilityResult(
+        credibility=source.credibility,
+        source_name=source.name,
+        is_fact_check=is_fact_check,
+        fact_check_source=fact_check_source,
+        verdict=match.verdict if is_fact_check else None,
+        hits=match.hits,
+    )
+
+
 def check_if_fact_check_article(url, title):
     """
     Check if an article is a fact-checking article
     Returns: (is_fact_check, source_name, verdict_from_title)
     """
-    url_lower = url.lower()
-    title_lower = title.lower()
-    
-    # Check if URL is from a fact-checking source
-    domain = extract_domain(url)
-    if domain:
-        for fact_check_domain, source_name in FACT_CHECKING_SOURCES.items():
-            if fact_check_domain in domain or domain in fact_check_domain:
-                # Try to extract verdict from title
-                verdict = extract_verdict_from_title(title)
-                return True, source_name, verdict
-    
-    # Check if title contains fact-check keywords
-    fact_check_keywords = [
-        'fact check', 'fact-check', 'factcheck',
-        'debunk', 'debunked', 'debunking',
-        'fake news', 'misleading', 'false claim',
-        'misinformation', 'disinformation',
-        'fact checked', 'claim check', 'truth check',
-        'viral claim', 'fake', 'hoax'
-    ]
-    
-    if any(keyword in title_lower for keyword in fact_check_keywords):
-        verdict = extract_verdict_from_title(title)
-        return True, 'Unknown Fact Checker', verdict
-    
-    return False, None, None
+    result = assess_article(url, title)
+    return result.is_fact_check, result.fact_check_source, result.verdict
 
 
 def extract_verdict_from_title(title):
     """Extract fact-check verdict from article title"""
-    title_lower = title.lower()
-    
-    # Common verdict indicators
-    if any(word in title_lower for word in ['false', 'fake', 'hoax', 'misleading', 'fabricated']):
-        return 'FALSE'
-    elif any(word in title_lower for word in ['true', 'verified', 'confirmed', 'correct']):
-        return 'TRUE'
-    elif any(word in title_lower for word in ['partially', 'partly', 'mixed', 'incomplete']):
-        return 'PARTIALLY_TRUE'
-    else:
-        return 'FACT_CHECK'
+    return classify_title(title).verdict
 
 
 def get_source_credibility(url):
@@ -118,42 +270,23 @@ def get_source_credibility(url):
     Determine source credibility level
     Returns: credibility_level (HIGH, MEDIUM, LOW, FACT_CHECKER, UNKNOWN)
     """
-    domain = extract_domain(url)
-    
-    if not domain:
-        return 'UNKNOWN'
-    
-    # Check if it's a fact-checking source
-    for fact_check_domain in FACT_CHECKING_SOURCES.keys():
-        if fact_check_domain in domain or domain in fact_check_domain:
-            return 'FACT_CHECKER'
-    
-    # Check high credibility sources
-    for high_cred_domain in HIGH_CREDIBILITY_SOURCES.keys():
-        if high_cred_domain in domain or domain in high_cred_domain:
-            return 'HIGH'
-    
-    # Check medium credibility sources
-    for med_cred_domain in MEDIUM_CREDIBILITY_SOURCES.keys():
-        if med_cred_domain in domain or domain in med_cred_domain:
-            return 'MEDIUM'
-    
-    # Unknown source
-    return 'UNKNOWN'
+    return lookup_source(url).credibility
 
 
-def should_trust_prediction(url, title, ml_prediction):
+def should_trust_prediction(url, title, ml_prediction, assessment=None):
     """
     Decide whether to trust ML prediction based on source credibility
+    `assessment` is the article's `CredibilityResult` when already computed
     Returns: (final_prediction, reasoning)
     """
-    credibility = get_source_credibility(url)
-    is_fact_check, fact_check_source, verdict = check_if_fact_check_article(url, title)
+    if assessment is None:
+        assessment = assess_article(url, title)
+    credibility = assessment.credibility
     
     # If it's a fact-checking article, it's about debunking fake news
     # So the article itself is TRUE, but it's discussing FALSE news
-    if is_fact_check:
-        return True, f"Fact-check article from {fact_check_source}"
+    if assessment.is_fact_check:
+        return True, f"Fact-check article from {assessment.fact_check_source}"
     
     # High credibility sources are more likely to be true
     if credibility == 'HIGH' and ml_prediction == False:
@@ -3,554 +3,141 @@ from rest_framework import viewsets, generics
 from rest_framework import status
 from rest_framework.views import APIView
 
-import requests
-
-from bs4 import BeautifulSoup
-
-from .models import LiveNews
-from .serializers import LiveNewsSerializer, LiveNewsDetailedSerializer
-from core.model import load_models
-from .source_credibility import (
-    get_source_credibility, 
-    check_if_fact_check_article, 
-    should_trust_prediction,
-    extract_domain
-)
-
-import threading
-import time
-from datetime import datetime
-import urllib.parse
-from email.utils import parsedate_to_datetime
-
-def get_google_news_india():
-    """Fetch news from Google News India"""
-    try:
-        news_articles = []
-        
-        # Google News RSS feed for India
-        rss_url = "https://news.google.com/rss?hl=en-IN&gl=IN&ceid=IN:en"
-        
-        response = requests.get(rss_url, timeout=10, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        
-        if response.status_code != 200:
-            print(f"Failed to fetch Google News India: {response.status_code}")
-            return []
-        
-        # Try XML parser first, fallback to html.parser
-        try:
-            soup = BeautifulSoup(response.content, 'xml')
-        except:
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-        items = soup.find_all('item')[:20]  # Get top 20 items
-        
-        for item in items:
-            try:
-                title = item.find('title').get_text(strip=True) if item.find('title') else None
-                link = item.find('link').get_text(strip=True) if item.find('link') else None
-                pub_date_str = item.find('pubDate').get_text(strip=True) if item.find('pubDate') else None
-                
-                # Convert RFC 822 date to Django datetime format
-                if pub_date_str:
-                    try:
-                        pub_date = parsedate_to_datetime(pub_date_str)
-                        pub_date = pub_date.isoformat()
-                    except:
-                        pub_date = datetime.now().isoformat()
-                else:
-                    pub_date = datetime.now().isoformat()
-                
-                if not title or not link:
-                    continue
-                
-                # Try to extract image from description (Google News includes image in HTML)
-                img_url = "https://via.placeholder.com/400x300/FFE500/1a1a1a?text=India+News"
-                
-                description = item.find('description')
-                if description:
-                    # Parse the HTML content inside description
-                    desc_html = str(description)
-                    desc_soup = BeautifulSoup(desc_html, 'html.parser')
-                    img_tag = desc_soup.find('img')
-                    if img_tag:
-                        img_src = img_tag.get('src') or img_tag.get('data-src')
-                        if img_src and img_src.startswith('http'):
-                            img_url = img_src
-                            print(f"Found image: {img_url[:60]}...")
-                
-                news_articles.append({
-                    'title': title,
-                    'web_url': link,
-                    'img_url': img_url,
-                    'category': 'News',
-                    'section_id': 'india-news',
-                    'section_name': 'India News',
-                    'publication_date': pub_date,
-                    'type': 'article'
-                })
-                    
-            except Exception as e:
-                print(f"Error parsing Google News item: {e}")
-                continue
-        
-        print(f"Fetched {len(news_articles)} articles from Google News India")
-        return news_articles
-        
-    except Exception as e:
-        print(f"Error fetching Google News India: {e}")
-        return []
-
-def get_times_of_india_news():
-    """Fetch news from Times of India RSS feed"""
-    try:
-        news_articles = []
-        
-        # Times of India RSS feeds
-        rss_feeds = [
-            ('https://timesofindia.indiatimes.com/rssfeedstopstories.cms', 'Top Stories'),
-            ('https://timesofindia.indiatimes.com/rssfeeds/1221656.cms', 'India News'),
-        ]
-        
-        for rss_url, category in rss_feeds:
-            try:
-                print(f"Fetching from Times of India: {category}")
-                response = requests.get(rss_url, timeout=10, headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                })
-                
-                if response.status_code != 200:
-                    print(f"Failed to fetch TOI RSS: {response.status_code}")
-                    continue
-                
-                soup = BeautifulSoup(response.content, 'xml')
-                items = soup.find_all('item')[:10]
-                
-                for item in items:
-                    try:
-                        title = item.find('title')
-                        title = title.get_text(strip=True) if title else None
-                        
-                        link = item.find('link')
-                        link = link.get_text(strip=True) if link else None
-                        
-                        if not title or not link:
-                            continue
-                        
-                        # Get publication date
-                        pub_date = item.find('pubDate')
-                        if pub_date:
-                            try:
-                                pub_date_dt = parsedate_to_datetime(pub_date.get_text(strip=True))
-                                pub_date_str = pub_date_dt.isoformat()
-                            except:
-                                pub_date_str = datetime.now().isoformat()
-                        else:
-                            pub_date_str = datetime.now().isoformat()
-                        
-                        # Extract image from description or enclosure
-                        img_url = "https://via.placeholder.com/400x300/FFE500/1a1a1a?text=Times+of+India"
-                        
-                        # Try enclosure tag first
-                        enclosure = item.find('enclosure')
-                        if enclosure and enclosure.get('url'):
-                            img_url = enclosure['url']
-                        else:
-                            # Try description
-                            description = item.find('description')
-                            if description:
-                                desc_html = str(description)
-                                desc_soup = BeautifulSoup(desc_html, 'html.parser')
-                                img_tag = desc_soup.find('img')
-                                if img_tag:
-                                    img_src = img_tag.get('src') or img_tag.get('data-src')
-                                    if img_src and img_src.startswith('http'):
-                                        img_url = img_src
-                        
-                        # Check for duplicates
-                        if any(a['web_url'] == link for a in news_articles):
-                            continue
-                        
-                        news_articles.append({
-                            'title': title,
-                            'web_url': link,
-                            'img_url': img_url,
-                            'category': category,
-                            'section_id': 'toi-india',
-                            'section_name': 'Times of India',
-                            'publication_date': pub_date_str,
-                            'type': 'article'
-                        })
-                        
-                        print(f"Added TOI: {title[:50]}...")
-                        
-                    except Exception as e:
-                        print(f"Error parsing TOI item: {e}")
-                        continue
-                
-                # Limit total
-                if len(news_articles) >= 15:
-                    break
-                    
-            except Exception as e:
-                print(f"Error fetching TOI RSS: {e}")
-                continue
-        
-        print(f"Total Times of India articles fetched: {len(news_articles)}")
-        return news_articles
-        
-    except Exception as e:
-        print(f"Error in get_times_of_india_news: {e}")
-        return []
+from django.db.models import F
+from django.urls import reverse
 
+from .models import LiveNews, RefreshJob, REGION_INDIA
+from .serializers import LiveNewsSerializer, LiveNewsDetailedSerializer, RefreshJobSerializer
+from .jobs import enqueue_refresh
+from .cache import cached_feed_response, get_cached_feed
+from .retention import get_retention_stats
 
-def get_altnews_fact_checks():
-    """Fetch fact-checking articles from AltNews"""
-    try:
-        news_articles = []
-        
-        # AltNews RSS feed
-        rss_url = "https://www.altnews.in/feed/"
-        
-        print(f"Fetching fact-checks from AltNews...")
-        response = requests.get(rss_url, timeout=10, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        
-        if response.status_code != 200:
-            print(f"Failed to fetch AltNews RSS: {response.status_code}")
-            return []
-        
-        soup = BeautifulSoup(response.content, 'xml')
-        items = soup.find_all('item')[:15]  # Get top 15 items
-        
-        for item in items:
-            try:
-                title = item.find('title')
-                title = title.get_text(strip=True) if title else None
-                
-                link = item.find('link')
-                link = link.get_text(strip=True) if link else None
-                
-                if not title or not link:
-                    continue
-                
-                # Get publication date
-                pub_date = item.find('pubDate')
-                if pub_date:
-                    try:
-                        pub_date_dt = parsedate_to_datetime(pub_date.get_text(strip=True))
-                        pub_date_str = pub_date_dt.isoformat()
-                    except:
-                        pub_date_str = datetime.now().isoformat()
-                else:
-                    pub_date_str = datetime.now().isoformat()
-                
-                # Extract image from description or media content
-                img_url = None
-                
-                # Try media:content tag (common in WordPress feeds)
-                media_content = item.find('media:content')
-                if media_content and media_content.get('url'):
-                    img_url = media_content['url']
-                    print(f"Found image from media:content: {img_url[:60]}...")
-                
-                # Try enclosure tag
-                if not img_url:
-                    enclosure = item.find('enclosure')
-                    if enclosure and enclosure.get('url'):
-                        img_url = enclosure['url']
-                        print(f"Found image from enclosure: {img_url[:60]}...")
-                
-                # Try content:encoded tag (WordPress extended content)
-                if not img_url:
-                    content_encoded = item.find('content:encoded')
-                    if content_encoded:
-                        content_html = str(content_encoded)
-                        content_soup = BeautifulSoup(content_html, 'html.parser')
-                        img_tag = content_soup.find('img')
-                        if img_tag:
-                            img_src = img_tag.get('src') or img_tag.get('data-src')
-                            if img_src and img_src.startswith('http'):
-                                img_url = img_src
-                                print(f"Found image from content:encoded: {img_url[:60]}...")
-                
-                # Try description
-                if not img_url:
-                    description = item.find('description')
-                    if description:
-                        desc_html = str(description)
-                        desc_soup = BeautifulSoup(desc_html, 'html.parser')
-                        img_tag = desc_soup.find('img')
-                        if img_tag:
-                            img_src = img_tag.get('src') or img_tag.get('data-src')
-                            if img_src and img_src.startswith('http'):
-                                img_url = img_src
-                                print(f"Found image from description: {img_url[:60]}...")
-                
-                # If still no image, try scraping the article page
-                if not img_url and link:
-                    print(f"No image in RSS feed, scraping article page: {link[:50]}...")
-                    scraped_img = scrap_img_from_altnews(link)
-                    if scraped_img and scraped_img != "None":
-                        img_url = scraped_img
-                        print(f"Found image from scraping: {img_url[:60]}...")
-                
-                # Fallback to placeholder
-                if not img_url:
-                    img_url = "https://via.placeholder.com/400x300/FF4444/FFFFFF?text=AltNews+Fact+Check"
-                    print("Using placeholder image for AltNews article")
-                
-                # Get category
-                category_tag = item.find('category')
-                category = category_tag.get_text(strip=True) if category_tag else 'Fact Check'
-                
-                # Check for duplicates
-                if any(a['web_url'] == link for a in news_articles):
-                    continue
-                
-                news_articles.append({
-                    'title': title,
-                    'web_url': link,
-                    'img_url': img_url,
-                    'category': category,
-                    'section_id': 'altnews-factcheck',
-                    'section_name': 'AltNews Fact Check',
-                    'publication_date': pub_date_str,
-                    'type': 'article',
-                    'is_fact_check': True  # Mark as fact-check article
-                })
-                
-                print(f"Added AltNews fact-check: {title[:60]}...")
-                
-            except Exception as e:
-                print(f"Error parsing AltNews item: {e}")
-                continue
-        
-        print(f"Total AltNews fact-checks fetched: {len(news_articles)}")
-        return news_articles
-        
-    except Exception as e:
-        print(f"Error fetching AltNews: {e}")
-        return []
 
-def get_new_news_from_api_and_update():
-    """Gets news from the guardian news using it's API and Onmanorama"""
-    
-    print("Fetching fresh news from sources...")
-    articles_added = 0
-    
-    # Fetch from Guardian API
-    try:
-        news_data = requests.get("https://content.guardianapis.com/search?api-key=e705adff-ca49-414e-89e2-7edede919e2e&show-fields=thumbnail&page-size=20", timeout=10)
-        news_data = news_data.json()
-
-        guardian_articles = []
-        for article in news_data["response"]["results"]:
-            try:
-                # Get thumbnail from fields
-                img_url = article.get("fields", {}).get("thumbnail", "None")
-                
-                # If no thumbnail in API, try scraping
-                if img_url == "None" or not img_url:
-                    img_url = scrap_img_from_web(article["webUrl"])
-                
-                # Skip articles without images
-                if img_url == "None":
-                    continue
-                
-                guardian_articles.append({
-                    'title': article["webTitle"],
-                    'web_url': article["webUrl"],
-                    'img_url': img_url,
-                    'category': article.get("pillarName", "Undefined"),
-                    'section_id': article["sectionId"],
-                    'section_name': article["sectionName"],
-                    'publication_date': article["webPublicationDate"],
-                    'type': article["type"],
-                    'is_fact_check': False
-                })
-            except Exception as e:
-                print(f"Error processing Guardian article: {e}")
-                continue
-        print(f"Fetched {len(guardian_articles)} articles from Guardian")
-    except Exception as e:
-        print(f"Error fetching Guardian news: {e}")
-        guardian_articles = []
-    
-    # Fetch from Times of India
-    toi_articles = get_times_of_india_news()
-    print(f"Fetched {len(toi_articles)} articles from Times of India")
-    
-    # Fetch from AltNews fact-checking
-    altnews_articles = get_altnews_fact_checks()
-    print(f"Fetched {len(altnews_articles)} fact-check articles from AltNews")
-    
-    # Combine all articles
-    all_articles = guardian_articles + toi_articles + altnews_articles
-    
-    nb_model, vect_model = load_models()
+# Orderings accepted by the feed endpoints' `ordering` parameter
+FEED_ORDERINGS = {
+    '-id': ('-id',),
+    'confidence': (F('ml_confidence').asc(nulls_last=True), '-id'),
+    '-confidence': (F('ml_confidence').desc(nulls_last=True), '-id'),
+}
+
+# Rows per page of the feeds; `limit` can only lower it
+FEED_PAGE_SIZE = 200
+
+
+def get_feed_params(request, page_size=FEED_PAGE_SIZE):
+    """Parses the `min_confidence`, `ordering`, `cursor` and `limit` query
+    parameters of a feed.
+
+    Returns `(params, error)`; `params` is None when a parameter is invalid.
+    """
+    ordering = request.query_params.get('ordering', '-id')
+    if ordering not in FEED_ORDERINGS:
+        return None, f"ordering must be one of: {', '.join(FEED_ORDERINGS)}"
 
-    for article_data in all_articles:
+    min_confidence = request.query_params.get('min_confidence')
+    if min_confidence is not None:
         try:
-            web_url_ = article_data['web_url']
-            title = article_data['title']
-            
-            if not LiveNews.objects.filter(web_url=web_url_).exists():
-                
-                # Get ML prediction
-                vectorized_text = vect_model.transform([title])
-                ml_prediction = nb_model.predict(vectorized_text)
-                ml_prediction_bool = True if ml_prediction[0] == 1 else False
-                
-                # Get source credibility
-                source_credibility = get_source_credibility(web_url_)
-                source_domain = extract_domain(web_url_)
-                
-                # Check if it's a fact-check article
-                is_fact_check, fact_check_source, verdict = check_if_fact_check_article(web_url_, title)
-                
-                # Determine final prediction based on source credibility
-                final_prediction, reasoning = should_trust_prediction(web_url_, title, ml_prediction_bool)
-                
-                print(f"Article: {title[:50]}...")
-                print(f"  ML Prediction: {ml_prediction_bool}, Source: {source_credibility}")
-                print(f"  Is Fact-Check: {is_fact_check}, Final: {final_prediction}")
-                print(f"  Reasoning: {reasoning}")
-                
-                news_article = LiveNews(
-                    title=title,
-                    publication_date=article_data['publication_date'],
-                    news_category=article_data['category'],
-                    prediction=final_prediction,  # Use improved prediction
-                    section_id=article_data['section_id'],
-                    section_name=article_data['section_name'],
-                    type=article_data['type'],
-                    web_url=web_url_,
-                    img_url=article_data['img_url'],
-                    source_credibility=source_credibility,
-                    is_fact_check_article=is_fact_check,
-                    fact_check_verdict=verdict if is_fact_check else None,
-                    source_domain=source_domain
-                )
-
-                news_article.save()
-                articles_added += 1
-                print(f"✓ Saved: {title[:50]}...")
-        except Exception as e:
-            print(f"Error saving article: {e}")
-            continue
-    
-    print(f"News refresh complete. Added {articles_added} new articles.")
-    return articles_added
-
-def scrap_img_from_web(url):
-    """Scrape image from Guardian article page"""
-    try:
-        r = requests.get(url, timeout=10)
-        if r.status_code != 200:
-            return "None"
-        web_content = r.content
-        soup = BeautifulSoup(web_content, 'html.parser')
-        
-        # Try different selectors for Guardian images
-        img = soup.find('img', class_='dcr-evn1e9')
-        if not img:
-            img = soup.find('picture')
-            if img:
-                img = img.find('img')
-        if not img:
-            # Try meta tags
-            meta_img = soup.find('meta', property='og:image')
-            if meta_img:
-                return meta_img.get('content', "None")
-        
-        if img:
-            src = img.get("src") or img.get("data-src")
-            if src:
-                return src
-        
-        return "None"
-    except Exception as e:
-        print(f"Error scraping image from {url}: {e}")
-        return "None"
-
-def scrap_img_from_altnews(url):
-    """Scrape image from AltNews article page"""
-    try:
-        r = requests.get(url, timeout=15, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        if r.status_code != 200:
-            print(f"Failed to scrape AltNews page: {r.status_code}")
-            return "None"
-        
-        soup = BeautifulSoup(r.content, 'html.parser')
-        
-        # Try og:image meta tag (most reliable)
-        meta_img = soup.find('meta', property='og:image')
-        if meta_img and meta_img.get('content'):
-            img_url = meta_img['content']
-            if img_url.startswith('http'):
-                return img_url
-        
-        # Try twitter:image
-        twitter_img = soup.find('meta', attrs={'name': 'twitter:image'})
-        if twitter_img and twitter_img.get('content'):
-            img_url = twitter_img['content']
-            if img_url.startswith('http'):
-                return img_url
-        
-        # Try featured image in article content
-        featured_img = soup.find('img', class_='wp-post-image')
-        if featured_img:
-            src = featured_img.get('src') or featured_img.get('data-src')
-            if src and src.startswith('http'):
-                return src
-        
-        # Try first image in article content
-        article = soup.find('article') or soup.find('div', class_='entry-content')
-        if article:
-            img = article.find('img')
-            if img:
-                src = img.get('src') or img.get('data-src')
-                if src and src.startswith('http'):
-                    return src
-        
-        return "None"
-    except Exception as e:
-        print(f"Error scraping AltNews image from {url}: {e}")
-        return "None"
-
-def auto_refresh_news():
-    """Auto refresh news periodically"""
-    print("Starting initial news fetch...")
-    get_new_news_from_api_and_update()
-    
-    interval = 300  # 5 minutes instead of 10 seconds for better performance
-    while True:
-        print("Auto-refreshing news...")
-        get_new_news_from_api_and_update()
-        time.sleep(interval)
+            min_confidence = float(min_confidence)
+        except ValueError:
+            min_confidence = -1.0
+        if not 0 <= min_confidence <= 1:
+            return None, "min_confidence must be a number between 0 and 1"
+
+    cursor = request.query_params.get('cursor')
+    if cursor is not None:
+        if ordering != '-id':
+            return None, "cursor can only be used with the -id ordering"
+        if not cursor.isdigit():
+            return None, "cursor must be a news id"
+        cursor = int(cursor)
+
+    limit = request.query_params.get('limit', str(page_size))
+    if not limit.isdigit() or not 1 <= int(limit) <= page_size:
+        return None, f"limit must be a number between 1 and {page_size}"
+
+    return {
+        'min_confidence': min_confidence,
+        'ordering': ordering,
+        'cursor': cursor,
+        'limit': int(limit),
+    }, None
+
+
+def filter_feed(live_news, min_confidence=None, ordering='-id', cursor=None, limit=FEED_PAGE_SIZE):
+    """Applies the feed parameters to a `LiveNews` queryset and slices a page.
 
+    Pages are keyset-paginated on `id`: `cursor` is the id of the last row of
+    the previous page, so deep pages cost the same as the first one.
+    """
+    if min_confidence is not None:
+        live_news = live_news.filter(ml_confidence__gte=min_confidence)
+    if cursor is not None:
+        live_news = live_news.filter(id__lt=cursor)
+    return live_news.order_by(*FEED_ORDERINGS[ordering])[:limit]
 
-auto_refresh_thread = threading.Thread(target=auto_refresh_news)
-auto_refresh_thread.daemon = True
-auto_refresh_thread.start()
+
+def get_next_cursor(data, ordering='-id', limit=FEED_PAGE_SIZE, **params):
+    """Returns the cursor of the page after `data`, or None on the last page."""
+    if ordering != '-id' or len(data) < limit:
+        return None
+    return data[-1]['id']
+
+
+def add_next_page_headers(request, response, next_cursor):
+    """Advertises the next page in `Link` and `X-Next-Cursor` headers."""
+    if next_cursor is None:
+        return response
+    query = request.query_params.copy()
+    query['cursor'] = next_cursor
+    next_url = request.build_absolute_uri(f'{request.path}?{query.urlencode()}')
+    response['Link'] = f'<{next_url}>; rel="next"'
+    response['X-Next-Cursor'] = str(next_cursor)
+    return response
+
+
+def cached_page_response(request, endpoint, build, params, **key_params):
+    """Serves a cached feed page with its next-page headers."""
+    response = cached_feed_response(request, endpoint, build, **key_params, **params)
+    if response.status_code == status.HTTP_200_OK:
+        add_next_page_headers(request, response, get_next_cursor(response.data, **params))
+    return response
+
+
+def get_latest_news_data(limit, min_confidence=None, ordering='-id', cursor=None):
+    """Serializes the latest `limit` news with images."""
+    live_news = LiveNews.objects.filter(has_image=True)
+    live_news = filter_feed(live_news, min_confidence, ordering, cursor, limit)
+    return LiveNewsDetailedSerializer(live_news, many=True).data
+
+
+def refresh_job_response(request, job, created, data, message, **extra):
+    """Builds the 202 answer for a queued refresh, with the current news."""
+    return Response({
+        "success": True,
+        "message": message if created else "A refresh is already in progress.",
+        "job_id": str(job.id),
+        "status": job.status,
+        "status_url": request.build_absolute_uri(reverse('core-api:refresh-job', args=[job.id])),
+        "count": len(data),
+        "data": data,
+        **extra
+    }, status=status.HTTP_202_ACCEPTED)
 
 
 class LiveNewsPrediction(viewsets.ViewSet):
     http_method_names = ('get', 'post', )
 
     def list(self, request):
-        """Handles GET request by displaying all newly retrieved in database."""
-        all_live_news = LiveNews.objects.filter(img_url__isnull=False).exclude(img_url='None').order_by('-id')[:200]
+        """Handles GET request by displaying all newly retrieved in database.
 
-        serializer = LiveNewsDetailedSerializer(all_live_news, many=True)
-
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        Supports `min_confidence` (0-1), `ordering` (-id, confidence,
+        -confidence), `limit` and `cursor` query parameters. The next page is
+        linked in the `Link` and `X-Next-Cursor` headers.
+        """
+        params, error = get_feed_params(request)
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        return cached_page_response(request, 'live', lambda: get_latest_news_data(**params), params)
 
     def retrieve(self, request, pk=None):
         """Get's all data from a specific id in database."""
@@ -564,22 +151,15 @@ class LiveNewsPrediction(viewsets.ViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
     
     def create(self, request):
-        """Force refresh news from API sources."""
+        """Queues a refresh of news from API sources."""
         try:
             print("Manual refresh triggered by user...")
-            # Run the news fetch function
-            articles_added = get_new_news_from_api_and_update()
+            job, created = enqueue_refresh('refresh')
             
-            # Return updated news
-            all_live_news = LiveNews.objects.filter(img_url__isnull=False).exclude(img_url='None').order_by('-id')[:200]
-            serializer = LiveNewsDetailedSerializer(all_live_news, many=True)
+            # Return current news while the refresh runs in the background
+            data, _ = get_cached_feed('live', lambda: get_latest_news_data(200))
             
-            return Response({
-                "message": f"News refreshed successfully. {articles_added} new articles added.",
-                "count": len(all_live_news),
-                "new_articles": articles_added,
-                "data": serializer.data
-            }, status=status.HTTP_200_OK)
+            return refresh_job_response(request, job, created, data, "News refresh queued.")
         except Exception as e:
             print(f"Error in manual refresh: {str(e)}")
             return Response({
@@ -589,9 +169,16 @@ class LiveNewsPrediction(viewsets.ViewSet):
 class LiveNewsByCategory(viewsets.ViewSet):
     def list(self, request, category=None):
         if category is not None:
-            live_news = LiveNews.objects.filter(news_category=category, img_url__isnull=False).exclude(img_url='None').order_by('-id')[:200]
-            serializer = LiveNewsDetailedSerializer(live_news, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            params, error = get_feed_params(request)
+            if error:
+                return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+
+            def build():
+                live_news = LiveNews.objects.filter(news_category=category, has_image=True)
+                live_news = filter_feed(live_news, **params)
+                return LiveNewsDetailedSerializer(live_news, many=True).data
+
+            return cached_page_response(request, 'category', build, params, category=category)
         else:
             return Response({'error': 'Category not provided in the URL'}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -600,31 +187,18 @@ class RefreshNewsView(APIView):
     """Dedicated endpoint to force refresh news from external sources"""
     
     def get(self, request):
-        """Handle GET request to refresh news"""
+        """Handle GET request to queue a news refresh"""
         try:
             print("=" * 60)
             print("MANUAL NEWS REFRESH TRIGGERED")
             print("=" * 60)
             
-            # Run the news fetch function
-            articles_added = get_new_news_from_api_and_update()
-            
-            # Return updated news
-            all_live_news = LiveNews.objects.filter(img_url__isnull=False).exclude(img_url='None').order_by('-id')[:30]
-            serializer = LiveNewsDetailedSerializer(all_live_news, many=True)
+            job, created = enqueue_refresh('refresh')
             
-            response_data = {
-                "success": True,
-                "message": f"News refreshed successfully. {articles_added} new articles added.",
-                "count": len(all_live_news),
-                "new_articles": articles_added,
-                "data": serializer.data
-            }
+            # Return current news while the refresh runs in the background
+            data, _ = get_cached_feed('latest', lambda: get_latest_news_data(30))
             
-            print(f"✓ Refresh completed: {articles_added} new articles")
-            print("=" * 60)
-            
-            return Response(response_data, status=status.HTTP_200_OK)
+            return refresh_job_response(request, job, created, data, "News refresh queued.")
             
         except Exception as e:
             print(f"✗ Error in manual refresh: {str(e)}")
@@ -635,111 +209,72 @@ class RefreshNewsView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class RefreshJobStatusView(APIView):
+    """Reports the state of a refresh job queued by the refresh endpoints"""
+    
+    def get(self, request, job_id):
+        try:
+            job = RefreshJob.objects.get(id=job_id)
+        except RefreshJob.DoesNotExist:
+            return Response({"error": "Refresh job not found"}, status=status.HTTP_404_NOT_FOUND)
+        
+        return Response(RefreshJobSerializer(job).data, status=status.HTTP_200_OK)
+
+
+# Rows per page of the India feed
+INDIA_PAGE_SIZE = 50
+
+
+def get_india_news_data(cursor=None, limit=INDIA_PAGE_SIZE, **params):
+    """Serializes a page of India-specific news, or of all news if there are too few.
+
+    Returns `{'data': ..., 'next_cursor': ...}`. The fallback to all news
+    only applies to the first page and has no next page.
+    """
+    india_news = LiveNews.objects.filter(region=REGION_INDIA, has_image=True)
+    india_news = filter_feed(india_news, cursor=cursor, limit=limit, **params)
+    data = LiveNewsDetailedSerializer(india_news, many=True).data
+    next_cursor = get_next_cursor(data, limit=limit, **params)
+
+    # If not enough India-specific news, get all recent news
+    if cursor is None and len(data) < min(10, limit):
+        live_news = filter_feed(LiveNews.objects.filter(has_image=True), limit=limit, **params)
+        data = LiveNewsDetailedSerializer(live_news, many=True).data
+        next_cursor = None
+    
+    return {'data': data, 'next_cursor': next_cursor}
+
+
 class IndiaNewsView(APIView):
     """Dedicated endpoint to fetch India-specific news from Google News India and Times of India"""
     
     def get(self, request):
-        """Handle GET request to fetch India news"""
+        """Handle GET request to queue an India news refresh
+
+        Pages through older news with the `cursor` and `limit` query
+        parameters; `next_cursor` in the body points to the next page.
+        """
+        params, error = get_feed_params(request, page_size=INDIA_PAGE_SIZE)
+        if error:
+            return Response({"success": False, "error": error}, status=status.HTTP_400_BAD_REQUEST)
+
         try:
             print("=" * 60)
             print("FETCHING INDIA NEWS FROM GOOGLE NEWS & TIMES OF INDIA")
             print("=" * 60)
             
-            articles_added = 0
-            
-            # Fetch from Google News India
-            google_news_articles = get_google_news_india()
-            print(f"Fetched {len(google_news_articles)} from Google News India")
-            
-            # Fetch from Times of India
-            toi_articles = get_times_of_india_news()
-            print(f"Fetched {len(toi_articles)} from Times of India")
-            
-            # Fetch from AltNews (fact-checking)
-            altnews_articles = get_altnews_fact_checks()
-            print(f"Fetched {len(altnews_articles)} fact-checks from AltNews")
-            
-            # Combine articles
-            all_articles = google_news_articles + toi_articles + altnews_articles
-            
-            # Load ML models
-            nb_model, vect_model = load_models()
-            
-            # Save articles to database
-            for article_data in all_articles:
-                try:
-                    web_url_ = article_data['web_url']
-                    title = article_data['title']
-                    
-                    if not LiveNews.objects.filter(web_url=web_url_).exists():
-                        # Get ML prediction
-                        vectorized_text = vect_model.transform([title])
-                        ml_prediction = nb_model.predict(vectorized_text)
-                        ml_prediction_bool = True if ml_prediction[0] == 1 else False
-                        
-                        # Get source credibility
-                        source_credibility = get_source_credibility(web_url_)
-                        source_domain = extract_domain(web_url_)
-                        
-                        # Check if it's a fact-check article
-                        is_fact_check = article_data.get('is_fact_check', False)
-                        if not is_fact_check:
-                            is_fact_check, fact_check_source, verdict = check_if_fact_check_article(web_url_, title)
-                        else:
-                            verdict = 'FACT_CHECK'
-                        
-                        # Determine final prediction based on source credibility
-                        final_prediction, reasoning = should_trust_prediction(web_url_, title, ml_prediction_bool)
-                        
-                        news_article = LiveNews(
-                            title=title,
-                            publication_date=article_data['publication_date'],
-                            news_category=article_data['category'],
-                            prediction=final_prediction,
-                            section_id=article_data['section_id'],
-                            section_name=article_data['section_name'],
-                            type=article_data['type'],
-                            web_url=web_url_,
-                            img_url=article_data['img_url'],
-                            source_credibility=source_credibility,
-                            is_fact_check_article=is_fact_check,
-                            fact_check_verdict=verdict if is_fact_check else None,
-                            source_domain=source_domain
-                        )
-                        news_article.save()
-                        articles_added += 1
-                        print(f"Saved: {title[:50]}...")
-                except Exception as e:
-                    print(f"Error saving article: {e}")
-                    continue
+            # Google News India, Times of India and AltNews are fetched in the background
+            job, created = enqueue_refresh('india')
             
             # Return India-specific news
-            india_news = LiveNews.objects.filter(
-                img_url__isnull=False
-            ).exclude(img_url='None').filter(
-                section_id__icontains='india'
-            ).order_by('-id')[:50]
-            
-            # If not enough India-specific news, get all recent news
-            if india_news.count() < 10:
-                india_news = LiveNews.objects.filter(
-                    img_url__isnull=False
-                ).exclude(img_url='None').order_by('-id')[:30]
-            
-            serializer = LiveNewsDetailedSerializer(india_news, many=True)
-            
-            response_data = {
-                "success": True,
-                "message": f"India news fetched successfully. {articles_added} new articles added.",
-                "count": len(serializer.data),
-                "new_articles": articles_added,
-                "data": serializer.data
-            }
-            
-            print(f"✓ India news fetch completed: {articles_added} new articles")
-            print("=" * 60)
+            india_news, _ = get_cached_feed('india', lambda: get_india_news_data(**params), **params)
+            india_news_data, next_cursor = india_news['data'], india_news['next_cursor']
             
-            return Response(response_data, status=status.HTTP_200_OK)
+            response = refresh_job_response(
+                request, job, created, india_news_data, "India news refresh queued.",
+                next_cursor=next_cursor
+            )
+            return add_next_page_headers(request, response, next_cursor)
             
         except Exception as e:
             print(f"✗ Error fetching India news: {str(e)}")
@@ -747,4 +282,11 @@ class IndiaNewsView(APIView):
             return Response({
                 "success": False,
                 "error": f"Failed to fetch India news: {str(e)}"
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class LiveNewsMetricsView(APIView):
+    """Reports how many news the database retains, and how much space they take"""
+
+    def get(self, request):
+        return Response(get_retention_stats(), status=status.HTTP_200_OK)
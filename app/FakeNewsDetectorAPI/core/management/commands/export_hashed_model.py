@@ -0,0 +1,44 @@
+import json
+import os
+
+import pandas as pd
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.model import MODEL_DIR
+from core.model_formats import export_hashed, load_hashed, load_pickles, parity_report
+
+
+class Command(BaseCommand):
+    help = 'Export the pickled NB model to the hashed array format and report parity'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--n-features', type=int,
+                            default=getattr(settings, 'NB_HASH_FEATURES', 2 ** 18),
+                            help='Number of hash buckets')
+        parser.add_argument('--output', default=os.path.join(MODEL_DIR, 'hashed'),
+                            help='Directory to write the arrays to')
+        parser.add_argument('--parity-data',
+                            default=os.path.join(settings.BASE_DIR, 'game_data', 'game_data.csv'),
+                            help='CSV file with title and label columns for the parity report')
+
+    def handle(self, *args, **options):
+        if options['n_features'] <= 0:
+            raise CommandError('--n-features must be positive')
+
+        reference = load_pickles(MODEL_DIR)
+        meta = export_hashed(*reference, options['output'], options['n_features'])
+        self.stdout.write(
+            f"Exported version {meta['version']}: {meta['vocabulary_size']} tokens in "
+            f"{meta['occupied_buckets']} of {meta['n_features']} buckets"
+        )
+
+        df = pd.read_csv(options['parity_data'])
+        candidate = load_hashed(options['output'])[:2]
+        report = parity_report(reference, candidate, df['title'].astype(str).tolist(), df['label'])
+        with open(os.path.join(options['output'], 'parity.json'), 'w') as f:
+            json.dump(report, f, indent=2)
+
+        for name, value in report.items():
+            self.stdout.write(f'  {name}: {value}')
+        self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
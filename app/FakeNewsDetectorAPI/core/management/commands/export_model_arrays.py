@@ -0,0 +1,35 @@
+import json
+import os
+
+import pandas as pd
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.model import MODEL_DIR
+from core.model_formats import export_arrays, load_arrays_format, load_pickles, parity_report
+
+
+class Command(BaseCommand):
+    help = 'Export the pickled NB model to the pickle-free array format and report parity'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=os.path.join(MODEL_DIR, 'arrays'),
+                            help='Directory to write the arrays to')
+        parser.add_argument('--parity-data',
+                            default=os.path.join(settings.BASE_DIR, 'game_data', 'game_data.csv'),
+                            help='CSV file with title and label columns for the parity report')
+
+    def handle(self, *args, **options):
+        reference = load_pickles(MODEL_DIR)
+        meta = export_arrays(*reference, options['output'])
+        self.stdout.write(f"Exported version {meta['version']}: {meta['vocabulary_size']} tokens")
+
+        df = pd.read_csv(options['parity_data'])
+        candidate = load_arrays_format(options['output'])[:2]
+        report = parity_report(reference, candidate, df['title'].astype(str).tolist(), df['label'])
+        with open(os.path.join(options['output'], 'parity.json'), 'w') as f:
+            json.dump(report, f, indent=2)
+
+        for name, value in report.items():
+            self.stdout.write(f'  {name}: {value}')
+        self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
@@ -1,12 +1,265 @@
 from django.conf import settings
+import hashlib
+import numpy as np
 import os
 import pickle
+import threading
+import time
+
+from .model_formats import META_FILE, load_arrays_format, load_hashed, read_meta
+
+# Array formats by preference, each loaded from the model directory's
+# subdirectory of the same name
+ARRAY_FORMATS = {
+    'arrays': load_arrays_format,
+    'hashed': load_hashed,
+}
+
+
+class TokenExplainer:
+    """Ranks the tokens of vectorized texts by how much they drive the NB decision.
+
+    A token's contribution to the real/fake log-odds is its count times the
+    difference of the classes' `feature_log_prob_`, precomputed once per model.
+    """
+
+    def __init__(self, nb_model, vect_model):
+        classes = list(nb_model.classes_)
+        real, fake = classes.index(1), classes.index(0)
+        self.log_ratio = nb_model.feature_log_prob_[real] - nb_model.feature_log_prob_[fake]
+        self._vect_model = vect_model
+        self._feature_names = None
+
+    @property
+    def feature_names(self):
+        # Built on first use, so workers that never explain a prediction do
+        # not hold them
+        if self._feature_names is None:
+            self._feature_names = self._vect_model.get_feature_names_out()
+        return self._feature_names
+
+    def top_tokens(self, vectorized_text, predictions, top_k):
+        """Returns, per row, up to `top_k` `(token, weight)` pairs that push
+        towards the row's prediction (True for real), strongest first."""
+        X = vectorized_text.tocsr()
+        n_rows = X.shape[0]
+        counts = np.diff(X.indptr)
+        width = min(top_k, counts.max(initial=0))
+        if width == 0:
+            return [[] for _ in range(n_rows)]
+
+        # Contributions towards each row's predicted class, padded into a dense
+        # (rows x max tokens per row) matrix
+        rows = np.repeat(np.arange(n_rows), counts)
+        direction = np.where(np.asarray(predictions, dtype=bool), 1.0, -1.0)
+        weights = X.data * self.log_ratio[X.indices] * direction[rows]
+        positions = np.arange(len(X.indices)) - X.indptr[rows]
+        padded = np.full((n_rows, counts.max()), -np.inf)
+        padded[rows, positions] = weights
+        features = np.zeros(padded.shape, dtype=X.indices.dtype)
+        features[rows, positions] = X.indices
+
+        if padded.shape[1] > width:
+            top = np.argpartition(-padded, width - 1, axis=1)[:, :width]
+        else:
+            top = np.broadcast_to(np.arange(width), (n_rows, width))
+        top_weights = np.take_along_axis(padded, top, axis=1)
+        order = np.argsort(-top_weights, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_weights = np.take_along_axis(top_weights, order, axis=1)
+        top_names = self.feature_names[np.take_along_axis(features, top, axis=1)]
+
+        keep = top_weights > 0
+        return [
+            list(zip(names[mask].tolist(), np.round(weights[mask], 4).tolist()))
+            for names, weights, mask in zip(top_names, top_weights, keep)
+        ]
+
+
+class ModelRegistry:
+    """Process-wide registry for the NB classifier and its vectorizer.
+
+    Both artifacts are loaded once per process and handed out as shared,
+    read-only instances. With `model_format='auto'`, an exported array format
+    found in `model_dir` (see `core.model_formats`) is preferred over the
+    pickles. The files on disk are re-checked at most every `check_interval`
+    seconds; when their mtime/size changes and their content hash differs
+    from the loaded one, a fresh pair is loaded and swapped in atomically so
+    callers never see a model from one version next to a vectorizer from
+    another.
+    """
+
+    def __init__(self, model_dir, model_format='auto', check_interval=30):
+        self.nb_model_path = os.path.join(model_dir, "nb_model.pkl")
+        self.vectorizer_model_path = os.path.join(model_dir, "vectorizer_model.pkl")
+        self.format_dirs = {fmt: os.path.join(model_dir, fmt) for fmt in ARRAY_FORMATS}
+        self.model_format = model_format
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._file_stats = None
+        self._last_checked = 0.0
+
+    def _resolve_format(self):
+        if self.model_format != 'auto':
+            return self.model_format
+        for fmt in ARRAY_FORMATS:
+            if os.path.exists(os.path.join(self.format_dirs[fmt], META_FILE)):
+                return fmt
+        return 'pickle'
+
+    def _stat_files(self):
+        model_format = self._resolve_format()
+        if model_format == 'pickle':
+            paths = (self.nb_model_path, self.vectorizer_model_path)
+        else:
+            # meta.json is rewritten last by every export
+            paths = (os.path.join(self.format_dirs[model_format], META_FILE),)
+        stats = []
+        for path in paths:
+            st = os.stat(path)
+            stats.append((st.st_mtime_ns, st.st_size))
+        return model_format, tuple(stats)
+
+    def _load(self, file_stats):
+        model_format = file_stats[0]
+        if model_format == 'pickle':
+            with open(self.nb_model_path, "rb") as f:
+                nb_bytes = f.read()
+            with open(self.vectorizer_model_path, "rb") as f:
+                vect_bytes = f.read()
+            version = hashlib.sha1(nb_bytes + vect_bytes).hexdigest()[:12]
+        else:
+            model_dir = self.format_dirs[model_format]
+            version = read_meta(model_dir)["version"]
+
+        if self._snapshot is not None and self._snapshot["version"] == version:
+            # Files were touched but not changed, keep the loaded instances.
+            self._file_stats = file_stats
+            return
+
+        started = time.perf_counter()
+        if model_format == 'pickle':
+            nb_model = pickle.loads(nb_bytes)
+            vect_model = pickle.loads(vect_bytes)
+        else:
+            nb_model, vect_model, version = ARRAY_FORMATS[model_format](model_dir)
+        explainer = TokenExplainer(nb_model, vect_model)
+        load_seconds = time.perf_counter() - started
+
+        # Publish the new pair with a single assignment.
+        self._snapshot = {
+            "nb_model": nb_model,
+            "vect_model": vect_model,
+            "explainer": explainer,
+            "format": model_format,
+            "version": version,
+            "loaded_at": time.time(),
+            "load_seconds": load_seconds,
+        }
+        self._file_stats = file_stats
+        print(f"Loaded ML models version {version} ({model_format}) in {load_seconds:.3f}s")
+
+    def _refresh_if_stale(self):
+        now = time.monotonic()
+        if self._snapshot is not None and now - self._last_checked < self.check_interval:
+            return
+        with self._lock:
+            if self._snapshot is not None and now - self._last_checked < self.check_interval:
+                return
+            file_stats = self._stat_files()
+            if self._snapshot is None or file_stats != self._file_stats:
+                self._load(file_stats)
+            self._last_checked = now
+
+    def get(self):
+        """Returns the current `(nb_model, vect_model)` pair."""
+        self._refresh_if_stale()
+        snapshot = self._snapshot
+        return snapshot["nb_model"], snapshot["vect_model"]
+
+    def get_with_explainer(self):
+        """Returns the current `(nb_model, vect_model, explainer)` triple, all
+        from the same version."""
+        self._refresh_if_stale()
+        snapshot = self._snapshot
+        return snapshot["nb_model"], snapshot["vect_model"], snapshot["explainer"]
+
+    def info(self):
+        """Returns the version and load time of the current models."""
+        self._refresh_if_stale()
+        snapshot = self._snapshot
+        return {
+            "format": snapshot["format"],
+            "version": snapshot["version"],
+            "loaded_at": snapshot["loaded_at"],
+            "load_seconds": snapshot["load_seconds"],
+        }
+
+
+MODEL_DIR = os.path.join(settings.BASE_DIR, "models")
+
+model_registry = ModelRegistry(
+    MODEL_DIR,
+    model_format=getattr(settings, "NB_MODEL_FORMAT", "auto"),
+    check_interval=getattr(settings, "MODEL_RELOAD_CHECK_INTERVAL", 30),
+)
+
 
 def load_models():
-    nb_model_path = os.path.join(settings.BASE_DIR, "models", "nb_model.pkl")
-    vectorizer_model_path = os.path.join(settings.BASE_DIR, "models", "vectorizer_model.pkl")
-    
-    nb_model = pickle.load(open(nb_model_path, "rb"))
-    vect_model = pickle.load(open(vectorizer_model_path, "rb"))
-    
-    return nb_model, vect_model
\ No newline at end of file
+    """Returns the shared `(nb_model, vect_model)` pair from the registry."""
+    return model_registry.get()
+
+
+def predict_titles(titles):
+    """Scores a batch of titles with one `transform` and one `predict_proba` call.
+
+    Returns a list of `(prediction, probability)` tuples in input order, where
+    `prediction` is True for real news and `probability` is the model's
+    probability of the real class.
+    """
+    if not titles:
+        return []
+
+    nb_model, vect_model = load_models()
+    vectorized_text = vect_model.transform(titles)
+    probabilities = nb_model.predict_proba(vectorized_text)
+
+    classes = list(nb_model.classes_)
+    real_column = classes.index(1)
+    predicted = nb_model.classes_[probabilities.argmax(axis=1)]
+
+    return [
+        (bool(label == 1), float(row[real_column]))
+        for label, row in zip(predicted, probabilities)
+    ]
+
+
+def explain_titles(titles, top_k=5):
+    """Scores a batch of titles and explains every prediction.
+
+    Returns one dict per title with `prediction` (True for real news),
+    `probability` (of the real class), `confidence` (probability of the
+    predicted class) and `top_tokens`, the `top_k` tokens that pushed the
+    model the most towards its prediction.
+    """
+    if not titles:
+        return []
+
+    nb_model, vect_model, explainer = model_registry.get_with_explainer()
+    vectorized_text = vect_model.transform(titles)
+    probabilities = nb_model.predict_proba(vectorized_text)
+
+    real_probabilities = probabilities[:, list(nb_model.classes_).index(1)]
+    predictions = nb_model.classes_[probabilities.argmax(axis=1)] == 1
+    tokens = explainer.top_tokens(vectorized_text, predictions, top_k)
+
+    return [
+        {
+            'prediction': bool(prediction),
+            'probability': float(probability),
+            'confidence': float(max(probability, 1 - probability)),
+            'top_tokens': [{'token': token, 'weight': weight} for token, weight in row_tokens],
+        }
+        for prediction, probability, row_tokens in zip(predictions, real_probabilities, tokens)
+    ]
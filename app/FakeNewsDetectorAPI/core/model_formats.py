@@ -0,0 +1,343 @@
+"""
+Pickle-free formats of the NB title classifier
+Every format stores the model as plain NumPy arrays plus a `meta.json`, loaded
+with `np.load(mmap_mode='r')` so worker processes share the pages
+"""
+
+import hashlib
+import json
+import os
+import pickle
+
+import numpy as np
+from scipy.special import logsumexp
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+from sklearn.preprocessing import normalize
+from sklearn.feature_extraction import FeatureHasher
+
+META_FILE = 'meta.json'
+
+# CountVectorizer parameters that define how a title is tokenized
+ANALYZER_PARAMS = ('lowercase', 'token_pattern', 'ngram_range', 'strip_accents')
+
+
+class ArrayNB:
+    """Multinomial NB classifier over plain `class_log_prior_` and
+    `feature_log_prob_` arrays, with the prediction API of sklearn's."""
+
+    def __init__(self, classes, class_log_prior, feature_log_prob):
+        self.classes_ = classes
+        self.class_log_prior_ = class_log_prior
+        self.feature_log_prob_ = feature_log_prob
+
+    def predict_joint_log_proba(self, X):
+        return np.asarray(X @ self.feature_log_prob_.T) + self.class_log_prior_
+
+    def predict_log_proba(self, X):
+        jll = self.predict_joint_log_proba(X)
+        return jll - logsumexp(jll, axis=1, keepdims=True)
+
+    def predict_proba(self, X):
+        return np.exp(self.predict_log_proba(X))
+
+    def predict(self, X):
+        return self.classes_[self.predict_joint_log_proba(X).argmax(axis=1)]
+
+
+class HashedTitleVectorizer:
+    """Feature-hashing replacement for the fitted CountVectorizer.
+
+    Titles are tokenized like the original vectorizer and every token is
+    hashed into one of `n_features` buckets, so no vocabulary is needed.
+    `tokens` and `token_buckets` only serve explanations: they name every
+    bucket after the vocabulary tokens hashed into it.
+    """
+
+    def __init__(self, analyzer_params, stop_words, n_features, tokens, token_buckets):
+        self.n_features = n_features
+        self.hashing_vectorizer = HashingVectorizer(
+            n_features=n_features, alternate_sign=False, norm=None,
+            stop_words=stop_words, **analyzer_params
+        )
+        self._tokens = tokens
+        self._token_buckets = token_buckets
+        self._feature_names = None
+
+    def transform(self, titles):
+        return self.hashing_vectorizer.transform(titles)
+
+    def get_feature_names_out(self):
+        if self._feature_names is None:
+            names = np.full(self.n_features, '', dtype=object)
+            for token, bucket in zip(self._tokens.tolist(), self._token_buckets.tolist()):
+                names[bucket] = f'{names[bucket]}|{token}' if names[bucket] else token
+            self._feature_names = names
+        return self._feature_names
+
+
+class ArrayVectorizer:
+    """Vocabulary-array replacement for the fitted CountVectorizer (or
+    TfidfVectorizer), producing identical feature matrices.
+
+    The vocabulary is a sorted array of UTF-8 encoded tokens (byte order
+    matches the vectorizer's string order), so a token's feature index is its
+    position, found with one `searchsorted` over all tokens of a batch.
+    """
+
+    def __init__(self, analyzer_params, stop_words, vocabulary, idf=None, norm=None, sublinear_tf=False):
+        self.analyzer = CountVectorizer(stop_words=stop_words, **analyzer_params).build_analyzer()
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.norm = norm
+        self.sublinear_tf = sublinear_tf
+        self._feature_names = None
+
+    def transform(self, titles):
+        analyzed = [self.analyzer(title) for title in titles]
+        lengths = np.fromiter((len(tokens) for tokens in analyzed), dtype=np.int64, count=len(analyzed))
+        rows = np.repeat(np.arange(len(analyzed)), lengths)
+        tokens = np.array([token.encode() for tokens in analyzed for token in tokens], dtype=bytes)
+
+        columns = np.searchsorted(self.vocabulary, tokens)
+        columns[columns == len(self.vocabulary)] = 0
+        known = self.vocabulary[columns] == tokens if len(tokens) else np.zeros(0, dtype=bool)
+
+        X = csr_matrix(
+            (np.ones(known.sum(), dtype=np.int64), (rows[known], columns[known])),
+            shape=(len(analyzed), len(self.vocabulary))
+        )
+        X.sum_duplicates()
+        if self.idf is None:
+            return X
+
+        X = X.astype(np.float64)
+        if self.sublinear_tf:
+            np.log(X.data, X.data)
+            X.data += 1
+        X = X.multiply(self.idf).tocsr()
+        return normalize(X, norm=self.norm, copy=False) if self.norm else X
+
+    def get_feature_names_out(self):
+        if self._feature_names is None:
+            self._feature_names = np.char.decode(self.vocabulary, 'utf-8')
+        return self._feature_names
+
+
+def analyzer_params(vect_model):
+    params = vect_model.get_params()
+    return {name: params[name] for name in ANALYZER_PARAMS}
+
+
+def stop_words_of(vect_model):
+    """Returns the stop words of a vectorizer as a sorted list (or None)."""
+    stop_words = vect_model.get_stop_words()
+    return sorted(stop_words) if stop_words else None
+
+
+def hash_tokens(tokens, n_features):
+    """Returns the bucket of every token, exactly as `HashingVectorizer` hashes it."""
+    hasher = FeatureHasher(n_features=n_features, input_type='string', alternate_sign=False)
+    hashed = hasher.transform([token] for token in tokens)
+    return hashed.tocsr().indices.astype(np.int32)
+
+
+def reproject_log_prob(feature_log_prob, token_buckets, n_features):
+    """Maps per-token `feature_log_prob_` onto hash buckets.
+
+    A bucket gets the log of the summed probabilities of its tokens, which is
+    what NB would learn from the merged counts. Empty buckets get 0, so tokens
+    hashed there contribute nothing, like out-of-vocabulary tokens before.
+    """
+    n_classes = feature_log_prob.shape[0]
+    rows = np.repeat(np.arange(n_classes), len(token_buckets))
+    buckets = np.tile(token_buckets, n_classes)
+    values = feature_log_prob.ravel()
+
+    peaks = np.full((n_classes, n_features), -np.inf)
+    np.maximum.at(peaks, (rows, buckets), values)
+    sums = np.zeros((n_classes, n_features))
+    np.add.at(sums, (rows, buckets), np.exp(values - peaks[rows, buckets]))
+
+    reprojected = np.zeros((n_classes, n_features))
+    filled = sums > 0
+    reprojected[filled] = peaks[filled] + np.log(sums[filled])
+    return reprojected
+
+
+def array_file(name, version):
+    return f'{name}-{version}.npy'
+
+
+def write_arrays(output_dir, arrays, meta):
+    """Saves the arrays as `.npy` files plus `meta.json`, versioned by content.
+
+    Array files are named after the version and never rewritten in place, so
+    workers still mapping the previous export keep reading intact files.
+    `meta.json` is swapped last and points to the new files.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    digest = hashlib.sha1()
+    for name in sorted(arrays):
+        digest.update(name.encode())
+        digest.update(arrays[name].tobytes())
+    meta = dict(meta, arrays=sorted(arrays))
+    digest.update(json.dumps(meta, sort_keys=True).encode())
+    meta['version'] = digest.hexdigest()[:12]
+    meta['files'] = {name: array_file(name, meta['version']) for name in arrays}
+
+    for name, array in arrays.items():
+        path = os.path.join(output_dir, meta['files'][name])
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, array, allow_pickle=False)
+        os.replace(tmp_path, path)
+
+    try:
+        previous = read_meta(output_dir)
+    except (OSError, ValueError):
+        previous = {}
+
+    # meta.json is written last: its presence marks a complete export
+    tmp_path = os.path.join(output_dir, f'{META_FILE}.{os.getpid()}.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, os.path.join(output_dir, META_FILE))
+
+    # Files of older exports can go, except those of the export just replaced,
+    # which workers may still be loading. Mapped files that are removed stay
+    # readable until unmapped; where they cannot be removed (Windows), they
+    # are left for the next export.
+    keep = set(meta['files'].values()) | set(previous.get('files', {}).values())
+    for filename in os.listdir(output_dir):
+        if filename.endswith('.npy') and filename not in keep:
+            try:
+                os.remove(os.path.join(output_dir, filename))
+            except OSError:
+                pass
+    return meta
+
+
+def read_meta(model_dir):
+    with open(os.path.join(model_dir, META_FILE)) as f:
+        return json.load(f)
+
+
+def load_arrays(model_dir, meta):
+    # Exports older than versioned file names stored `{name}.npy`
+    files = meta.get('files', {})
+    return {
+        name: np.load(os.path.join(model_dir, files.get(name, f'{name}.npy')), mmap_mode='r', allow_pickle=False)
+        for name in meta['arrays']
+    }
+
+
+def export_hashed(nb_model, vect_model, output_dir, n_features):
+    """Writes the hashed format of a fitted CountVectorizer + MultinomialNB pair."""
+    tokens = vect_model.get_feature_names_out()
+    token_buckets = hash_tokens(tokens, n_features)
+    arrays = {
+        'classes': nb_model.classes_,
+        'class_log_prior': nb_model.class_log_prior_,
+        'feature_log_prob': reproject_log_prob(nb_model.feature_log_prob_, token_buckets, n_features),
+        'tokens': tokens.astype(str),
+        'token_buckets': token_buckets,
+    }
+    meta = {
+        'format': 'hashed',
+        'n_features': n_features,
+        'analyzer': analyzer_params(vect_model),
+        'stop_words': stop_words_of(vect_model),
+        'vocabulary_size': len(tokens),
+        'occupied_buckets': int(len(np.unique(token_buckets))),
+    }
+    return write_arrays(output_dir, arrays, meta)
+
+
+def load_hashed(model_dir):
+    """Returns `(nb_model, vect_model, version)` of an exported hashed model."""
+    meta = read_meta(model_dir)
+    arrays = load_arrays(model_dir, meta)
+    analyzer = dict(meta['analyzer'], ngram_range=tuple(meta['analyzer']['ngram_range']))
+    nb_model = ArrayNB(arrays['classes'], arrays['class_log_prior'], arrays['feature_log_prob'])
+    vect_model = HashedTitleVectorizer(
+        analyzer, meta['stop_words'], meta['n_features'], arrays['tokens'], arrays['token_buckets']
+    )
+    return nb_model, vect_model, meta['version']
+
+
+def export_arrays(nb_model, vect_model, output_dir):
+    """Writes the vocabulary-array format of a fitted vectorizer + MultinomialNB pair."""
+    vocabulary = np.array([token.encode() for token in vect_model.get_feature_names_out()], dtype=bytes)
+    if np.any(vocabulary[:-1] >= vocabulary[1:]):
+        raise ValueError("The vectorizer's features are not sorted by token")
+
+    arrays = {
+        'classes': nb_model.classes_,
+        'class_log_prior': nb_model.class_log_prior_,
+        'feature_log_prob': nb_model.feature_log_prob_,
+        'vocabulary': vocabulary,
+    }
+    meta = {
+        'format': 'arrays',
+        'analyzer': analyzer_params(vect_model),
+        'stop_words': stop_words_of(vect_model),
+        'vocabulary_size': len(vocabulary),
+    }
+    # Only TfidfVectorizer has an idf; the project's CountVectorizer does not
+    if getattr(vect_model, 'idf_', None) is not None:
+        arrays['idf'] = vect_model.idf_
+        meta['norm'] = vect_model.norm
+        meta['sublinear_tf'] = vect_model.sublinear_tf
+    return write_arrays(output_dir, arrays, meta)
+
+
+def load_arrays_format(model_dir):
+    """Returns `(nb_model, vect_model, version)` of an exported array model."""
+    meta = read_meta(model_dir)
+    arrays = load_arrays(model_dir, meta)
+    analyzer = dict(meta['analyzer'], ngram_range=tuple(meta['analyzer']['ngram_range']))
+    nb_model = ArrayNB(arrays['classes'], arrays['class_log_prior'], arrays['feature_log_prob'])
+    vect_model = ArrayVectorizer(
+        analyzer, meta['stop_words'], arrays['vocabulary'],
+        idf=arrays.get('idf'), norm=meta.get('norm'), sublinear_tf=meta.get('sublinear_tf', False)
+    )
+    return nb_model, vect_model, meta['version']
+
+
+def load_pickles(model_dir):
+    """Returns the `(nb_model, vect_model)` pair pickled by the training notebook."""
+    with open(os.path.join(model_dir, 'nb_model.pkl'), 'rb') as f:
+        nb_model = pickle.load(f)
+    with open(os.path.join(model_dir, 'vectorizer_model.pkl'), 'rb') as f:
+        vect_model = pickle.load(f)
+    return nb_model, vect_model
+
+
+def real_probabilities(nb_model, vect_model, titles):
+    probabilities = nb_model.predict_proba(vect_model.transform(titles))
+    return probabilities[:, list(nb_model.classes_).index(1)]
+
+
+def parity_report(reference, candidate, titles, labels=None):
+    """Compares the predictions of two `(nb_model, vect_model)` pairs on `titles`."""
+    reference_proba = real_probabilities(*reference, titles)
+    candidate_proba = real_probabilities(*candidate, titles)
+    reference_pred = reference_proba >= 0.5
+    candidate_pred = candidate_proba >= 0.5
+    diff = np.abs(reference_proba - candidate_proba)
+
+    report = {
+        'samples': len(titles),
+        'agreement': float(np.mean(reference_pred == candidate_pred)),
+        'disagreements': int(np.sum(reference_pred != candidate_pred)),
+        'mean_abs_probability_diff': float(diff.mean()),
+        'p99_abs_probability_diff': float(np.percentile(diff, 99)),
+        'max_abs_probability_diff': float(diff.max()),
+    }
+    if labels is not None:
+        labels = np.asarray(labels) == 1
+        report['reference_accuracy'] = float(np.mean(reference_pred == labels))
+        report['candidate_accuracy'] = float(np.mean(candidate_pred == labels))
+    return report
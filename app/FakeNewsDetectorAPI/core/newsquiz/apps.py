@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class NewsquizConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core.newsquiz'
-    label = 'core_newsquiz'
\ No newline at end of file
+    label = 'core_newsquiz'
+
+    def ready(self):
+        from . import signals  # noqa: F401
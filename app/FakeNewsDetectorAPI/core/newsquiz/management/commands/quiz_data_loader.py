@@ -1,7 +1,54 @@
+from contextlib import nullcontext
+import csv
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
 from core.newsquiz.models import NewsQuizData
-import pandas as pd
-from django.core.management.base import BaseCommand
-import pandas as pd
+from core.newsquiz.selection import bump_ids_version
+
+# News texts can be far longer than the csv module's default field limit
+csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+
+
+def read_chunks(csv_file_path, chunk_size):
+    """Yields lists of at most `chunk_size` rows of the CSV file."""
+    with open(csv_file_path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        missing = {'title', 'text', 'label'} - set(reader.fieldnames or ())
+        if missing:
+            raise CommandError(f"CSV file has no {', '.join(sorted(missing))} column")
+        chunk = []
+        for row in reader:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def build_news(rows):
+    """Builds unsaved news from CSV rows, one per content hash.
+
+    Returns `(news, skipped)`, skipping rows with an invalid label.
+    """
+    news = {}
+    skipped = 0
+    for row in rows:
+        try:
+            label = bool(int(float(row['label'])))
+        except (TypeError, ValueError):
+            skipped += 1
+            continue
+        title, text = row['title'] or '', row['text'] or ''
+        content_hash = NewsQuizData.hash_content(title, text)
+        news[content_hash] = NewsQuizData(
+            news_title=title, news_description=text, label=label, content_hash=content_hash
+        )
+    return list(news.values()), skipped
 
 
 class Command(BaseCommand):
@@ -9,17 +56,56 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument('csv_file_path', type=str, help='Path to the CSV file')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Rows inserted per transaction')
+        mode = parser.add_mutually_exclusive_group()
+        mode.add_argument('--truncate', action='store_true',
+                          help='Replace all quiz news with the CSV file')
+        mode.add_argument('--upsert', action='store_true',
+                          help='Update the label of news that are already loaded')
 
     def handle(self, *args, **options):
         csv_file_path = options['csv_file_path']
-        df = pd.read_csv(csv_file_path)
-    
-        for index, row in df.iterrows():
-            NewsQuizData.objects.create(
-                news_title=row['title'],
-                news_description=row['text'],
-                label=row['label']
-            )
-            # Add other fields as needed
-
-        self.stdout.write(self.style.SUCCESS('Successfully loaded data from CSV'))
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        # News already loaded (same title and text) are skipped, or updated
+        # with --upsert, so loading a file twice is harmless
+        if options['upsert']:
+            conflict_options = {
+                'update_conflicts': True, 'unique_fields': ['content_hash'], 'update_fields': ['label'],
+            }
+        else:
+            conflict_options = {'ignore_conflicts': True}
+
+        started = time.monotonic()
+        rows_read = rows_skipped = 0
+        try:
+            # --truncate swaps the data in one transaction, so the quiz is never
+            # empty; otherwise every chunk is committed on its own
+            with transaction.atomic() if options['truncate'] else nullcontext():
+                if options['truncate']:
+                    with connection.cursor() as cursor:
+                        cursor.execute(f'DELETE FROM {connection.ops.quote_name(NewsQuizData._meta.db_table)}')
+
+                for rows in read_chunks(csv_file_path, batch_size):
+                    news, skipped = build_news(rows)
+                    with transaction.atomic():
+                        NewsQuizData.objects.bulk_create(news, batch_size=batch_size, **conflict_options)
+                    rows_read += len(rows)
+                    rows_skipped += skipped
+        except OSError as e:
+            raise CommandError(f'Cannot read {csv_file_path}: {e}')
+        finally:
+            # bulk_create sends no signals
+            bump_ids_version()
+
+        elapsed = time.monotonic() - started
+        rate = rows_read / elapsed if elapsed else 0
+        if rows_skipped:
+            self.stdout.write(self.style.WARNING(f'Skipped {rows_skipped} rows with an invalid label'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully loaded {rows_read} rows from CSV in {elapsed:.2f}s ({rate:.0f} rows/s); '
+            f'the quiz has {NewsQuizData.objects.count()} news'
+        ))
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.3 on 2026-10-18 03:16
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def hash_existing_news(apps, schema_editor):
+    """Hashes the news loaded before content_hash existed.
+
+    Only the first copy of a duplicated news gets the hash; the others keep
+    no hash so the unique index can be built.
+    """
+    NewsQuizData = apps.get_model('core_newsquiz', 'NewsQuizData')
+    seen = set()
+    updated = []
+    for news in NewsQuizData.objects.order_by('id').only('id', 'news_title', 'news_description').iterator():
+        content_hash = hashlib.sha256(f'{news.news_title}\0{news.news_description}'.encode()).hexdigest()
+        if content_hash in seen:
+            continue
+        seen.add(content_hash)
+        news.content_hash = content_hash
+        updated.append(news)
+    NewsQuizData.objects.bulk_update(updated, ['content_hash'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_newsquiz', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newsquizdata',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.RunPython(hash_existing_news, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='newsquizdata',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+    ]
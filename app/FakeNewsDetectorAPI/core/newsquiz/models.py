@@ -1,16 +1,45 @@
 from django.db import models
+import hashlib
 import random
 
+from .selection import quiz_ids, deal
+
 
 class NewsQuizDataManager(models.Manager):
     """A model manager to retrieve data from model."""
     def get_random_news(self):
         """Gets random news."""
-        count = self.all().count()
-        if count == 0:
+        _, ids = quiz_ids.get(self.all())
+        if not len(ids):
             return None
-        random_index = random.randint(0, count-1)
-        return self.all()[random_index]
+        return self.seek(ids[random.randrange(len(ids))])
+
+    def get_random_batch(self, n):
+        """Gets up to `n` distinct random news."""
+        _, ids = quiz_ids.get(self.all())
+        return self.fetch_ids(ids[random.sample(range(len(ids)), min(n, len(ids)))])
+
+    def deal_from_deck(self, deck, n=1):
+        """Gets the next `n` news of a shuffled deck, so that nothing repeats
+        until every news was dealt. Returns `(news, deck)`; pass the deck back
+        on the next call."""
+        version, ids = quiz_ids.get(self.all())
+        if not len(ids):
+            return [], deck
+        indexes, deck = deal(deck, len(ids), version, n)
+        return self.fetch_ids(ids[indexes]), deck
+
+    def seek(self, news_id):
+        """Gets the news with the smallest id from `news_id` on, wrapping
+        around, so ids deleted since they were cached still find a news."""
+        news = self.filter(id__gte=news_id).order_by('id').first()
+        return news or self.order_by('id').first()
+
+    def fetch_ids(self, ids):
+        """Gets the news of `ids` in one query, in the same order."""
+        ids = [int(news_id) for news_id in ids]
+        news = self.in_bulk(ids)
+        return [news[news_id] for news_id in ids if news_id in news]
 
     def get_label_of_news(self, news_id):
         """Get the label of news by it's id."""
@@ -26,9 +55,16 @@ class NewsQuizData(models.Model):
     news_title = models.TextField()
     news_description = models.TextField()
     label = models.BooleanField()
+    # Identifies the news across reloads of the quiz data
+    content_hash = models.CharField(max_length=64, unique=True, blank=True, null=True)
 
     objects = NewsQuizDataManager()
 
+    @staticmethod
+    def hash_content(news_title, news_description):
+        """Hashes the title and text of a news."""
+        return hashlib.sha256(f'{news_title}\0{news_description}'.encode()).hexdigest()
+
     def __str__(self):
         return {self.news_title}
     
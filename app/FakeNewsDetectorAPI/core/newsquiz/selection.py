@@ -0,0 +1,100 @@
+"""
+Random selection of quiz news
+The ids of the quiz table are loaded once per process and kept until the
+table changes, so a random item costs a single indexed seek instead of a
+COUNT(*) and an OFFSET scan
+"""
+
+from math import gcd
+import random
+import threading
+import time
+
+import numpy as np
+
+from django.conf import settings
+from django.core.cache import cache
+
+VERSION_KEY = 'newsquiz:ids-version'
+
+# Upper bound on staleness when the table is written by another process and
+# the cache backend is not shared (e.g. the local-memory default)
+ID_CACHE_TTL = getattr(settings, 'NEWSQUIZ_ID_CACHE_TTL', 300)
+
+
+def get_ids_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, timeout=None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def bump_ids_version():
+    """Makes every process reload the quiz ids."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, get_ids_version() + 1, timeout=None)
+
+
+class QuizIds:
+    """The sorted ids of the quiz table, reloaded when their version changes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = None
+        self._version = None
+        self._loaded_at = 0.0
+
+    def _stale(self, version):
+        return (
+            self._ids is None or self._version != version
+            or time.monotonic() - self._loaded_at > ID_CACHE_TTL
+        )
+
+    def get(self, queryset):
+        """Returns `(version, ids)`, loading the ids of `queryset` if needed."""
+        version = get_ids_version()
+        if self._stale(version):
+            with self._lock:
+                if self._stale(version):
+                    ids = queryset.order_by('id').values_list('id', flat=True)
+                    self._ids = np.fromiter(ids.iterator(chunk_size=10000), dtype=np.int64)
+                    self._version = version
+                    self._loaded_at = time.monotonic()
+        return self._version, self._ids
+
+
+quiz_ids = QuizIds()
+
+
+def new_deck(size, version):
+    """Starts a shuffled pass over `size` items.
+
+    The order is the affine permutation `k -> (a * k + b) mod size`, with `a`
+    coprime to `size`, so a deck is stored as four numbers instead of a list.
+    """
+    a = 1
+    if size > 2:
+        a = random.randrange(1, size)
+        while gcd(a, size) != 1:
+            a = random.randrange(1, size)
+    return {'size': size, 'a': a, 'b': random.randrange(max(size, 1)), 'position': 0, 'version': version}
+
+
+def deal(deck, size, version, n):
+    """Returns the next `n` indexes of `deck` and the updated deck.
+
+    A new deck is started when the table changed or every item was dealt.
+    """
+    if deck is None or deck.get('version') != version or deck.get('size') != size:
+        deck = new_deck(size, version)
+
+    indexes = []
+    while len(indexes) < min(n, size):
+        if deck['position'] >= size:
+            deck = new_deck(size, version)
+        indexes.append((deck['a'] * deck['position'] + deck['b']) % size)
+        deck['position'] += 1
+    return indexes, deck
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import NewsQuizData
+from .selection import bump_ids_version
+
+
+@receiver(post_save, sender=NewsQuizData)
+def quiz_news_saved(sender, created, **kwargs):
+    """New quiz news change the set of ids to pick from."""
+    if created:
+        bump_ids_version()
+
+
+@receiver(post_delete, sender=NewsQuizData)
+def quiz_news_deleted(sender, **kwargs):
+    bump_ids_version()
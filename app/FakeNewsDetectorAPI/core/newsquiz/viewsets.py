@@ -2,9 +2,15 @@ from rest_framework.response import Response
 from rest_framework import viewsets
 from rest_framework import status
 
+from django.conf import settings
+
 from .models import NewsQuizData
 from .serializers import NewsQuizSerializer, NewsQuizAnsweredSerializer
 
+# Most news a single `?n=` request can fetch
+MAX_BATCH = getattr(settings, 'NEWSQUIZ_MAX_BATCH', 50)
+DECK_SESSION_KEY = 'newsquiz_deck'
+
 
 class NewsQuizViewSet(viewsets.ViewSet):
     """A viewset to handle quiz."""
@@ -12,13 +18,33 @@ class NewsQuizViewSet(viewsets.ViewSet):
     serializer_class = NewsQuizAnsweredSerializer
 
     def list(self, request):
-        """Get's and returns random news from model."""
-        news_for_quiz = NewsQuizData.objects.get_random_news()
+        """Get's and returns random news from model.
+
+        `?n=` returns a list of up to n distinct news instead of one. With
+        `?deck=1`, news are dealt from a shuffled deck kept in the session,
+        so they don't repeat until the whole quiz was played.
+        """
+        n = request.query_params.get('n')
+        if n is not None:
+            if not n.isdigit() or not 1 <= int(n) <= MAX_BATCH:
+                return Response({'error': f'n must be a number between 1 and {MAX_BATCH}'},
+                                status=status.HTTP_400_BAD_REQUEST)
+            n = int(n)
 
-        serializer = NewsQuizSerializer(news_for_quiz)
+        if request.query_params.get('deck') in ('1', 'true'):
+            news, deck = NewsQuizData.objects.deal_from_deck(request.session.get(DECK_SESSION_KEY), n or 1)
+            request.session[DECK_SESSION_KEY] = deck
+        elif n is not None:
+            news = NewsQuizData.objects.get_random_batch(n)
+        else:
+            news_for_quiz = NewsQuizData.objects.get_random_news()
+            news = [news_for_quiz] if news_for_quiz else []
 
-        if news_for_quiz:
-            return Response(serializer.data, status=status.HTTP_200_OK)
+        if n is not None:
+            return Response(NewsQuizSerializer(news, many=True).data, status=status.HTTP_200_OK)
+        if news:
+            return Response(NewsQuizSerializer(news[0]).data, status=status.HTTP_200_OK)
+        return Response({'error': 'No news available for the quiz'}, status=status.HTTP_404_NOT_FOUND)
         
     def create(self, request):
         """Get's answer from user and checkes whether the answer is correct or wrong."""
@@ -1,7 +1,7 @@
 from rest_framework import routers
 from django.urls import path
-from core.usercheckbytitle.viewsets import UserCheckViewSet
-from core.livenews.viewsets import LiveNewsPrediction, LiveNewsByCategory, RefreshNewsView, IndiaNewsView
+from core.usercheckbytitle.viewsets import UserCheckViewSet, UserCheckMetricsView, user_check_stream
+from core.livenews.viewsets import LiveNewsPrediction, LiveNewsByCategory, RefreshNewsView, RefreshJobStatusView, IndiaNewsView, LiveNewsMetricsView
 from core.newsquiz.viewsets import NewsQuizViewSet
 
 router = routers.SimpleRouter()
@@ -12,7 +12,11 @@ router.register(r'quiz', NewsQuizViewSet, basename='quiz')
 router.register(r'category/(?P<category>[^/.]+)', LiveNewsByCategory, basename='livenews-by-category')
 
 urlpatterns = [
+    path('usercheck/title/stream/', user_check_stream, name='usercheck-stream'),
     path('refresh/', RefreshNewsView.as_view(), name='refresh-news'),
+    path('refresh/<uuid:job_id>/', RefreshJobStatusView.as_view(), name='refresh-job'),
     path('india-news/', IndiaNewsView.as_view(), name='india-news'),
+    path('metrics/livenews/', LiveNewsMetricsView.as_view(), name='livenews-metrics'),
+    path('metrics/usercheck/', UserCheckMetricsView.as_view(), name='usercheck-metrics'),
     *router.urls,
 ]
\ No newline at end of file
@@ -0,0 +1,258 @@
+"""
+Near-duplicate text matching with MinHash-LSH
+Texts are split into word shingles, signed with MinHash and bucketed by band,
+so a lookup only compares against the few texts sharing a bucket
+"""
+
+from collections import OrderedDict, namedtuple
+import atexit
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are merged but not serialized
+    fcntl = None
+
+from django.conf import settings
+
+PERSIST_INTERVAL = getattr(settings, 'SIMILARITY_PERSIST_INTERVAL', 300)
+MAX_ENTRIES = getattr(settings, 'SIMILARITY_MAX_ENTRIES', 20000)
+
+WORD = re.compile(r'\w+')
+
+# Result of a lookup: the matched entry and the Jaccard similarity of the shingles
+Match = namedtuple('Match', ['key', 'text', 'similarity'])
+
+
+def shingle_hashes(text, size=2):
+    """Returns the sorted, unique 32-bit hashes of the word shingles of `text`.
+
+    Texts shorter than `size` words are shingled as a whole.
+    """
+    words = WORD.findall(text.casefold())
+    if len(words) <= size:
+        shingles = {' '.join(words)} if words else set()
+    else:
+        shingles = {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), 'little')
+        for s in shingles
+    ]
+    return np.unique(np.array(hashes, dtype=np.uint64))
+
+
+def jaccard(a, b):
+    """Jaccard similarity of two sorted shingle hash arrays."""
+    if not len(a) or not len(b):
+        return 0.0
+    shared = len(np.intersect1d(a, b, assume_unique=True))
+    return shared / (len(a) + len(b) - shared)
+
+
+class MinHashIndex:
+    """In-memory MinHash-LSH index of texts, optionally persisted to a JSON file.
+
+    `threshold` is the minimum Jaccard similarity of a match. With the default
+    16 bands of 4 rows, pairs at 0.6 similarity share a bucket with a
+    probability above 0.87, and above 0.99 from 0.75 on. Candidates are then
+    checked against their exact shingle similarity. Beyond `max_entries`, the
+    oldest texts are dropped. Texts without any word are neither indexed nor
+    matched.
+
+    Several processes may share `path`: a save merges the entries other
+    processes saved meanwhile, so none of them overwrites the others.
+    """
+
+    def __init__(self, threshold, num_perm=64, bands=16, shingle_size=2,
+                 max_entries=MAX_ENTRIES, path=None, persist_interval=PERSIST_INTERVAL):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.max_entries = max_entries
+        self.path = path
+        self.persist_interval = persist_interval
+
+        # Multiply-shift hash family, seeded so signatures survive a restart
+        rng = np.random.RandomState(num_perm)
+        self._a = rng.randint(1, 2 ** 62, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.randint(0, 2 ** 62, size=num_perm, dtype=np.uint64)
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (text, shingles, signature, added_at)
+        self._buckets = [{} for _ in range(bands)]
+        self._removed = set()  # Keys removed since the last save
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        if path:
+            atexit.register(self.maybe_save, force=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def signature(self, shingles):
+        with np.errstate(over='ignore'):
+            hashed = (self._a[:, None] * shingles[None, :] + self._b[:, None]) >> np.uint64(32)
+        return hashed.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        return [
+            signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def add(self, key, text, added_at=None):
+        """Indexes `text` under `key`, replacing any previous text of that key."""
+        shingles = shingle_hashes(text, self.shingle_size)
+        if not len(shingles):
+            self.remove(key)
+            return
+        signature = self.signature(shingles)
+        with self._lock:
+            self._remove(key)
+            self._insert(key, (text, shingles, signature, added_at or time.time()))
+            self._removed.discard(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+            self._dirty = True
+
+    def remove(self, key):
+        with self._lock:
+            self._remove(key)
+            self._removed.add(key)
+            self._dirty = True
+
+    def _insert(self, key, entry):
+        self._entries[key] = entry
+        for buckets, band_key in zip(self._buckets, self._band_keys(entry[2])):
+            buckets.setdefault(band_key, set()).add(key)
+
+    def _replace_entries(self, entries):
+        """Replaces the index with the newest `max_entries` of `entries`."""
+        self._entries.clear()
+        for buckets in self._buckets:
+            buckets.clear()
+        entries = sorted(entries.items(), key=lambda item: item[1][3])
+        for key, entry in entries[-self.max_entries:]:
+            self._insert(key, entry)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for buckets, band_key in zip(self._buckets, self._band_keys(entry[2])):
+            bucket = buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del buckets[band_key]
+
+    def query(self, text, max_age=None):
+        """Returns the most similar `Match` at or above the threshold, or None.
+
+        Entries older than `max_age` seconds are ignored.
+        """
+        shingles = shingle_hashes(text, self.shingle_size)
+        if not len(shingles):
+            return None
+        signature = self.signature(shingles)
+        oldest = time.time() - max_age if max_age is not None else None
+
+        best = None
+        with self._lock:
+            candidates = set()
+            for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+                candidates.update(buckets.get(band_key, ()))
+            for key in candidates:
+                entry_text, entry_shingles, _, added_at = self._entries[key]
+                if oldest is not None and added_at < oldest:
+                    continue
+                similarity = jaccard(shingles, entry_shingles)
+                if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                    best = Match(key, entry_text, similarity)
+        return best
+
+    def save(self):
+        """Merges the entries saved by other processes, then writes the index
+        to `path` atomically."""
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(f'{self.path}.lock', 'w') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            saved = self._read() or {}
+            with self._lock:
+                entries = {
+                    key: entry for key, entry in saved.items() if key not in self._removed
+                }
+                entries.update(self._entries)
+                self._replace_entries(entries)
+                data = {
+                    'shingle_size': self.shingle_size,
+                    'num_perm': len(self._a),
+                    'entries': [
+                        [key, text, shingles.tolist(), signature.tolist(), added_at]
+                        for key, (text, shingles, signature, added_at) in self._entries.items()
+                    ],
+                }
+                self._removed.clear()
+                self._dirty = False
+                self._saved_at = time.monotonic()
+            tmp_path = f'{self.path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+
+    def maybe_save(self, force=False):
+        """Saves the index when it changed and the last save is old enough."""
+        if not self._dirty:
+            return
+        if force or time.monotonic() - self._saved_at >= self.persist_interval:
+            try:
+                self.save()
+            except OSError as e:
+                print(f"Error saving similarity index {self.path}: {e}")
+
+    def _read(self):
+        """Returns the entries saved at `path`, or None when there are none."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading similarity index {self.path}: {e}")
+            return None
+        if (data.get('shingle_size'), data.get('num_perm')) != (self.shingle_size, len(self._a)):
+            return None
+        return {
+            key: (text, np.array(shingles, dtype=np.uint64), np.array(signature, dtype=np.uint32), added_at)
+            for key, text, shingles, signature, added_at in data['entries']
+            if shingles
+        }
+
+    def load(self):
+        """Loads the index from `path`. Returns False when there is nothing to load."""
+        if not self.path:
+            return False
+        entries = self._read()
+        if entries is None:
+            return False
+        with self._lock:
+            self._replace_entries(entries)
+            self._removed.clear()
+            self._dirty = False
+        return True
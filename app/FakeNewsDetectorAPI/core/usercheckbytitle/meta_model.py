@@ -1,218 +1,498 @@
 """
 Meta 4 Scout + SerpAPI integration for enhanced news verification
 """
-from groq import Groq
+from groq import Groq, AsyncGroq
 from serpapi import GoogleSearch
+from asgiref.sync import sync_to_async
+from django.conf import settings
+import asyncio
+from collections import deque
+import httpx
 import os
 import logging
 import sys
+import threading
+import time
 
 # Add parent directory to path to import source_credibility module
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from livenews.source_credibility import (
-    get_source_credibility,
-    check_if_fact_check_article,
+    assess_article,
     FACT_CHECKING_SOURCES,
     HIGH_CREDIBILITY_SOURCES
 )
 
+from . import verification_cache
+
 logger = logging.getLogger(__name__)
 
+SERPAPI_URL = "https://serpapi.com/search"
+META_MODEL_NAME = "meta-llama/llama-4-scout-17b-16e-instruct"
+
+# Deadlines in seconds: connecting to either upstream, reading a search
+# response, reading each chunk of a completion, and a whole verification
+CONNECT_TIMEOUT = getattr(settings, 'META_CONNECT_TIMEOUT', 5)
+SEARCH_TIMEOUT = getattr(settings, 'META_SEARCH_TIMEOUT', 15)
+LLM_TIMEOUT = getattr(settings, 'META_LLM_TIMEOUT', 30)
+VERIFY_DEADLINE = getattr(settings, 'META_VERIFY_DEADLINE', 60)
+
+# Per-process caps on concurrent calls to each upstream, and how long a call
+# waits for a free slot before giving up
+SEARCH_CONCURRENCY = getattr(settings, 'META_SEARCH_CONCURRENCY', 8)
+LLM_CONCURRENCY = getattr(settings, 'META_LLM_CONCURRENCY', 4)
+UPSTREAM_WAIT = getattr(settings, 'META_UPSTREAM_WAIT', 5)
+
+
+class UpstreamBusy(Exception):
+    """Raised when an upstream has no free slot within the wait time."""
+
+
+class SlotWaiter:
+    """A caller queued for a slot of an `UpstreamLimit`."""
+
+    def __init__(self, notify):
+        self.notify = notify
+        self.granted = False
+
+
+class UpstreamLimit:
+    """Caps the concurrent calls to one upstream across threads and event loops.
+
+    Usable as `with limit:` from sync code and `async with limit:` from
+    coroutines; both share the same slots. Callers waiting for a slot are
+    served in order: a thread blocks on an event, a coroutine awaits a future
+    of its own loop, and a released slot is handed to the first of them.
+    """
+
+    def __init__(self, name, limit, wait=UPSTREAM_WAIT):
+        self.name = name
+        self.wait = wait
+        self._lock = threading.Lock()
+        self._free = limit
+        self._waiters = deque()
+
+    def _acquire(self, waiter):
+        """Takes a free slot, or queues `waiter` for one. Returns True when taken."""
+        with self._lock:
+            if self._free > 0:
+                self._free -= 1
+                return True
+            self._waiters.append(waiter)
+            return False
+
+    def _abandon(self, waiter):
+        """Dequeues a waiter that gave up. Returns True if it got a slot meanwhile."""
+        with self._lock:
+            if not waiter.granted:
+                self._waiters.remove(waiter)
+            return waiter.granted
+
+    def release(self):
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                try:
+                    waiter.notify()
+                except RuntimeError:
+                    # The waiter's event loop is closed
+                    continue
+                waiter.granted = True
+                return
+            self._free += 1
+
+    def busy(self):
+        return UpstreamBusy(f"Too many concurrent {self.name} requests")
+
+    def __enter__(self):
+        event = threading.Event()
+        waiter = SlotWaiter(event.set)
+        if self._acquire(waiter) or event.wait(self.wait) or self._abandon(waiter):
+            return self
+        raise self.busy()
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    async def __aenter__(self):
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+
+        def grant():
+            if not granted.done():
+                granted.set_result(True)
+
+        waiter = SlotWaiter(lambda: loop.call_soon_threadsafe(grant))
+        if self._acquire(waiter):
+            return self
+        try:
+            await asyncio.wait_for(granted, self.wait)
+        except asyncio.TimeoutError:
+            if self._abandon(waiter):
+                return self
+            raise self.busy()
+        except asyncio.CancelledError:
+            if self._abandon(waiter):
+                self.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.release()
+
+
+search_limit = UpstreamLimit('SerpAPI', SEARCH_CONCURRENCY)
+llm_limit = UpstreamLimit('Groq', LLM_CONCURRENCY)
+
+
+def format_search_results(news_results):
+    """Keeps the fields of the top 5 SerpAPI news results used by the model."""
+    return [
+        {
+            "title": result.get("title", ""),
+            "source": result.get("source", ""),
+            "snippet": result.get("snippet", ""),
+            "link": result.get("link", "")
+        }
+        for result in news_results[:5]
+    ]
+
+
+def build_prompt(user_news, search_results):
+    """Returns the fact-checking prompt and the source analysis of the results."""
+    # Analyze source credibility from search results
+    assessments = [
+        assess_article(result.get('link', ''), result.get('title', ''))
+        for result in search_results
+    ]
+    source_analysis = {
+        "high_credibility_sources": sum(1 for a in assessments if a.credibility == 'HIGH'),
+        "fact_check_sources": sum(1 for a in assessments if a.credibility == 'FACT_CHECKER')
+    }
+
+    # Create context from search results
+    context = "Search Results:\n"
+    for idx, (result, assessment) in enumerate(zip(search_results, assessments), 1):
+        context += f"\n{idx}. {result['title']}\n"
+        context += f"   Source: {result['source']} (Credibility: {assessment.credibility})\n"
+        if assessment.is_fact_check:
+            context += f"   [FACT-CHECK ARTICLE]\n"
+        context += f"   Snippet: {result['snippet']}\n"
+
+    # Create prompt for the model
+    prompt = f"""You are an expert news fact-checker. Analyze the following news claim against real search results.
+
+News Claim: "{user_news}"
+
+{context}
+
+IMPORTANT GUIDELINES:
+1. Articles from fact-checking websites (like AltNews, BOOM, AFP Fact Check) are DEBUNKING fake news - they are TRUE articles about FALSE claims
+2. High credibility sources (BBC, Reuters, The Guardian, etc.) are generally reliable
+3. Look for consensus among multiple credible sources
+4. Pay special attention to fact-check articles - they identify misinformation
+
+Based on the search results above, provide:
+1. A verdict: Is this claim TRUE, FALSE, or UNVERIFIABLE?
+2. Your confidence level (0-100%)
+3. A brief explanation (2-3 sentences)
+4. Key supporting or contradicting facts from the search results
+
+Format your response as:
+VERDICT: [TRUE/FALSE/UNVERIFIABLE]
+CONFIDENCE: [0-100]%
+EXPLANATION: [Your explanation]
+KEY FACTS: [Bullet points]"""
+    return prompt, source_analysis
+
+
+def completion_params(prompt, stream=False):
+    return {
+        "model": META_MODEL_NAME,
+        "messages": [
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        "temperature": 0.3,  # Lower temperature for more factual responses
+        "max_completion_tokens": 1024,
+        "top_p": 1,
+        "stream": stream,
+        "stop": None
+    }
+
+
+def parse_verdict(response_text):
+    """Returns `(verdict, confidence)` parsed from the model's answer."""
+    verdict = "UNVERIFIABLE"
+    confidence = 50
+
+    if "VERDICT:" in response_text:
+        verdict_line = [line for line in response_text.split("\n") if "VERDICT:" in line][0]
+        if "TRUE" in verdict_line and "FALSE" not in verdict_line:
+            verdict = "TRUE"
+        elif "FALSE" in verdict_line:
+            verdict = "FALSE"
+
+    if "CONFIDENCE:" in response_text:
+        conf_line = [line for line in response_text.split("\n") if "CONFIDENCE:" in line][0]
+        try:
+            confidence = int(''.join(filter(str.isdigit, conf_line)))
+        except:
+            confidence = 50
+
+    return verdict, confidence
+
+
+def build_result(response_text, search_results, source_analysis):
+    verdict, confidence = parse_verdict(response_text)
+
+    # Boost confidence if we have many high credibility sources
+    if source_analysis["high_credibility_sources"] >= 3:
+        confidence = min(confidence + 10, 100)
+
+    return {
+        "prediction": verdict == "TRUE",
+        "verdict": verdict,
+        "confidence": confidence,
+        "detailed_analysis": response_text,
+        "search_results": search_results,
+        "source_analysis": source_analysis
+    }
+
+
+def error_result(message, search_results):
+    return {
+        "prediction": False,
+        "verdict": "ERROR",
+        "confidence": 0,
+        "detailed_analysis": message,
+        "search_results": search_results,
+        "source_analysis": {
+            "high_credibility_sources": 0,
+            "fact_check_sources": 0
+        }
+    }
+
+
+def unverifiable_result(error):
+    return {
+        "prediction": False,
+        "verdict": "UNVERIFIABLE",
+        "confidence": 0,
+        "detailed_analysis": error,
+        "search_results": []
+    }
+
 
 class MetaNewsVerifier:
     """Uses Meta 4 Scout and SerpAPI to verify news authenticity"""
-    
+
     def __init__(self):
         self.groq_api_key = os.getenv('GROQ_API_KEY', 'your-groq-api-key-here')
         self.serpapi_key = os.getenv('SERPAPI_KEY', 'your-serpapi-key-here')
-        self.groq_client = Groq(api_key=self.groq_api_key)
-        
+        self.llm_timeout = httpx.Timeout(LLM_TIMEOUT, connect=CONNECT_TIMEOUT)
+        self.groq_client = Groq(api_key=self.groq_api_key, timeout=self.llm_timeout, max_retries=1)
+
         logger.info(f"MetaNewsVerifier initialized. GROQ key present: {bool(self.groq_api_key and self.groq_api_key != 'your-groq-api-key-here')}")
         logger.info(f"SERPAPI key present: {bool(self.serpapi_key and self.serpapi_key != 'your-serpapi-key-here')}")
-    
+
+    def search_params(self, query):
+        return {
+            "engine": "google",
+            "q": query,
+            "api_key": self.serpapi_key,
+            "tbm": "nws",  # News search
+            "num": 5
+        }
+
     def search_news(self, query):
         """Search for news using SerpAPI"""
         try:
             print(f"🔍 Searching for news: {query}")
             logger.info(f"Searching for news: {query}")
-            
-            params = {
-                "engine": "google",
-                "q": query,
-                "api_key": self.serpapi_key,
-                "tbm": "nws",  # News search
-                "num": 5
-            }
-            
+
+            params = self.search_params(query)
+
             print(f"📡 SerpAPI params: engine={params['engine']}, tbm={params['tbm']}, num={params['num']}")
             logger.info(f"SerpAPI params: engine={params['engine']}, tbm={params['tbm']}, num={params['num']}")
-            
+
             search = GoogleSearch(params)
-            results = search.get_dict()
-            
+            search.timeout = (CONNECT_TIMEOUT, SEARCH_TIMEOUT)  # Passed on to requests
+            with search_limit:
+                results = search.get_dict()
+
             print(f"📦 SerpAPI raw response keys: {list(results.keys())}")
             logger.info(f"SerpAPI raw response keys: {list(results.keys())}")
-            
+
             news_results = results.get("news_results", [])
-            
+
             print(f"📰 Found {len(news_results)} news results")
             logger.info(f"Found {len(news_results)} news results")
-            
+
             if not news_results:
                 print("⚠️ No search results found")
                 return None, "No search results found for this news."
-                return None, "No search results found for this news."
-                return None, "No search results found for this news."
-            
+
             # Format search results for the model
-            formatted_results = []
-            for result in news_results[:5]:
-                formatted_results.append({
-                    "title": result.get("title", ""),
-                    "source": result.get("source", ""),
-                    "snippet": result.get("snippet", ""),
-                    "link": result.get("link", "")
-                })
-            
-            return formatted_results, None
-            
+            return format_search_results(news_results), None
+
         except Exception as e:
             logger.error(f"Search error: {str(e)}")
             return None, f"Search error: {str(e)}"
-    
+
     def analyze_with_meta(self, user_news, search_results):
         """Analyze news using Meta 4 Scout model"""
         try:
-            # Analyze source credibility from search results
-            high_cred_sources = 0
-            fact_check_sources = 0
-            
-            for result in search_results:
-                link = result.get('link', '')
-                credibility = get_source_credibility(link)
-                if credibility == 'HIGH':
-                    high_cred_sources += 1
-                elif credibility == 'FACT_CHECKER':
-                    fact_check_sources += 1
-            
-            # Create context from search results
-            context = "Search Results:\n"
-            for idx, result in enumerate(search_results, 1):
-                link = result.get('link', '')
-                credibility = get_source_credibility(link)
-                is_fact_check, _, _ = check_if_fact_check_article(link, result.get('title', ''))
-                
-                context += f"\n{idx}. {result['title']}\n"
-                context += f"   Source: {result['source']} (Credibility: {credibility})\n"
-                if is_fact_check:
-                    context += f"   [FACT-CHECK ARTICLE]\n"
-                context += f"   Snippet: {result['snippet']}\n"
-            
-            # Create prompt for the model
-            prompt = f"""You are an expert news fact-checker. Analyze the following news claim against real search results.
+            prompt, source_analysis = build_prompt(user_news, search_results)
 
-News Claim: "{user_news}"
+            # Call Meta 4 Scout model
+            with llm_limit:
+                completion = self.groq_client.chat.completions.create(**completion_params(prompt))
 
-{context}
+            response_text = completion.choices[0].message.content
+            return build_result(response_text, search_results, source_analysis)
 
-IMPORTANT GUIDELINES:
-1. Articles from fact-checking websites (like AltNews, BOOM, AFP Fact Check) are DEBUNKING fake news - they are TRUE articles about FALSE claims
-2. High credibility sources (BBC, Reuters, The Guardian, etc.) are generally reliable
-3. Look for consensus among multiple credible sources
-4. Pay special attention to fact-check articles - they identify misinformation
+        except Exception as e:
+            return error_result(f"Error analyzing news: {str(e)}", search_results)
 
-Based on the search results above, provide:
-1. A verdict: Is this claim TRUE, FALSE, or UNVERIFIABLE?
-2. Your confidence level (0-100%)
-3. A brief explanation (2-3 sentences)
-4. Key supporting or contradicting facts from the search results
+    def get_cached(self, user_news):
+        """Looks the claim up in the verification cache.
 
-Format your response as:
-VERDICT: [TRUE/FALSE/UNVERIFIABLE]
-CONFIDENCE: [0-100]%
-EXPLANATION: [Your explanation]
-KEY FACTS: [Bullet points]"""
+        Returns `(claim, key, search_results, result)`; `result` is a cached
+        verdict (of this claim or of a similar one) and `search_results` the
+        cached search, either of them None when missing.
+        """
+        claim = verification_cache.normalize_claim(user_news)
+        key = verification_cache.claim_key(claim)
+        search_results, cached_result = verification_cache.lookup(key)
+
+        if cached_result is not None:
+            verification_cache.record(verification_cache.HIT)
+            logger.info(f"Verification cache hit for: {claim[:80]}")
+            return claim, key, search_results, cached_result
+
+        similar = verification_cache.find_similar_result(claim, key)
+        if similar is not None:
+            result, matched_claim, similarity = similar
+            verification_cache.record(verification_cache.SIMILAR_HIT)
+            logger.info(f"Verification cache similar hit ({similarity:.2f}) for: {claim[:80]}")
+            result = {**result, "matched_claim": matched_claim, "similarity": round(similarity, 3)}
+            return claim, key, search_results, result
+
+        if search_results is not None:
+            verification_cache.record(verification_cache.SEARCH_HIT)
+            logger.info(f"Verification cache search hit for: {claim[:80]}")
+        else:
+            verification_cache.record(verification_cache.MISS)
+        return claim, key, search_results, None
 
-            # Call Meta 4 Scout model
-            completion = self.groq_client.chat.completions.create(
-                model="meta-llama/llama-4-scout-17b-16e-instruct",
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,  # Lower temperature for more factual responses
-                max_completion_tokens=1024,
-                top_p=1,
-                stream=False,
-                stop=None
-            )
-            
-            response_text = completion.choices[0].message.content
-            
-            # Parse the response
-            verdict = "UNVERIFIABLE"
-            confidence = 50
-            
-            if "VERDICT:" in response_text:
-                verdict_line = [line for line in response_text.split("\n") if "VERDICT:" in line][0]
-                if "TRUE" in verdict_line and "FALSE" not in verdict_line:
-                    verdict = "TRUE"
-                elif "FALSE" in verdict_line:
-                    verdict = "FALSE"
-            
-            if "CONFIDENCE:" in response_text:
-                conf_line = [line for line in response_text.split("\n") if "CONFIDENCE:" in line][0]
-                try:
-                    confidence = int(''.join(filter(str.isdigit, conf_line)))
-                except:
-                    confidence = 50
-            
-            # Boost confidence if we have many high credibility sources
-            if high_cred_sources >= 3:
-                confidence = min(confidence + 10, 100)
-            
-            return {
-                "prediction": verdict == "TRUE",
-                "verdict": verdict,
-                "confidence": confidence,
-                "detailed_analysis": response_text,
-                "search_results": search_results,
-                "source_analysis": {
-                    "high_credibility_sources": high_cred_sources,
-                    "fact_check_sources": fact_check_sources
-                }
-            }
-            
-        except Exception as e:
-            return {
-                "prediction": False,
-                "verdict": "ERROR",
-                "confidence": 0,
-                "detailed_analysis": f"Error analyzing news: {str(e)}",
-                "search_results": search_results,
-                "source_analysis": {
-                    "high_credibility_sources": 0,
-                    "fact_check_sources": 0
-                }
-            }
-    
     def verify_news(self, user_news):
-        """Main method to verify news"""
-        # Step 1: Search for the news
-        search_results, error = self.search_news(user_news)
-        
-        if error:
-            return {
-                "prediction": False,
-                "verdict": "UNVERIFIABLE",
-                "confidence": 0,
-                "detailed_analysis": error,
-                "search_results": []
-            }
-        
+        """Main method to verify news
+
+        Search results and verdicts are served from the verification cache
+        while fresh; errors are never cached. A claim close enough to a
+        recently verified one gets that verdict, along with the matched claim.
+        """
+        claim, key, search_results, cached_result = self.get_cached(user_news)
+        if cached_result is not None:
+            return cached_result
+
+        if search_results is None:
+            # Step 1: Search for the news
+            search_results, error = self.search_news(user_news)
+
+            if error:
+                return unverifiable_result(error)
+            verification_cache.store(key, claim, search_results=search_results)
+
         # Step 2: Analyze with Meta model
         analysis = self.analyze_with_meta(user_news, search_results)
-        
+        if analysis["verdict"] != "ERROR":
+            verification_cache.store(key, claim, result=analysis)
+
         return analysis
+
+    async def asearch_news(self, query, timeout):
+        """Search for news using SerpAPI without blocking the event loop"""
+        try:
+            logger.info(f"Searching for news: {query}")
+            async with search_limit:
+                async with httpx.AsyncClient(timeout=httpx.Timeout(timeout, connect=CONNECT_TIMEOUT)) as client:
+                    response = await client.get(SERPAPI_URL, params=self.search_params(query))
+            results = response.json()
+
+            if "error" in results:
+                return None, f"Search error: {results['error']}"
+            news_results = results.get("news_results", [])
+            logger.info(f"Found {len(news_results)} news results")
+
+            if not news_results:
+                return None, "No search results found for this news."
+            return format_search_results(news_results), None
+
+        except Exception as e:
+            logger.error(f"Search error: {str(e)}")
+            return None, f"Search error: {str(e) or type(e).__name__}"
+
+    async def stream_verify_news(self, user_news):
+        """Verifies news asynchronously, yielding `(event, data)` pairs.
+
+        Events are `search` (the search results), `token` (a chunk of the
+        model's answer, as it arrives) and finally `verdict` (the same result
+        as `verify_news`). The whole verification is bounded by
+        VERIFY_DEADLINE; closing the generator or cancelling the task
+        iterating it (see `core.asgi.CancelOnDisconnect`) cancels the upstream
+        request in flight.
+        """
+        deadline = time.monotonic() + VERIFY_DEADLINE
+
+        def remaining():
+            return max(deadline - time.monotonic(), 0.001)
+
+        claim, key, search_results, cached_result = await sync_to_async(self.get_cached)(user_news)
+        if cached_result is not None:
+            yield "search", {"search_results": cached_result.get("search_results", [])}
+            yield "verdict", cached_result
+            return
+
+        if search_results is None:
+            search_results, error = await self.asearch_news(user_news, min(SEARCH_TIMEOUT, remaining()))
+            if error:
+                yield "verdict", unverifiable_result(error)
+                return
+            await sync_to_async(verification_cache.store)(key, claim, search_results=search_results)
+        yield "search", {"search_results": search_results}
+
+        prompt, source_analysis = build_prompt(user_news, search_results)
+        chunks = []
+        try:
+            async with llm_limit:
+                async with AsyncGroq(api_key=self.groq_api_key, timeout=self.llm_timeout, max_retries=0) as client:
+                    stream = await asyncio.wait_for(
+                        client.chat.completions.create(**completion_params(prompt, stream=True)),
+                        remaining()
+                    )
+                    async with stream:
+                        stream_chunks = stream.__aiter__()
+                        while True:
+                            try:
+                                chunk = await asyncio.wait_for(stream_chunks.__anext__(), remaining())
+                            except StopAsyncIteration:
+                                break
+                            text = chunk.choices[0].delta.content if chunk.choices else None
+                            if text:
+                                chunks.append(text)
+                                yield "token", {"text": text}
+        except asyncio.TimeoutError:
+            yield "verdict", error_result(
+                f"Error analyzing news: no verdict within {VERIFY_DEADLINE}s", search_results
+            )
+            return
+        except Exception as e:
+            yield "verdict", error_result(f"Error analyzing news: {str(e)}", search_results)
+            return
+
+        analysis = build_result(''.join(chunks), search_results, source_analysis)
+        await sync_to_async(verification_cache.store)(key, claim, result=analysis)
+        yield "verdict", analysis
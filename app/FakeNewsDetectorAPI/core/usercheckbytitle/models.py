@@ -0,0 +1,20 @@
+from django.db import models
+
+
+class VerificationCache(models.Model):
+    """Caches the search results and the verdict of a claim checked with the
+    meta model, keyed on a hash of the normalized claim text.
+
+    Search results and verdicts expire separately, so a claim whose verdict is
+    stale can be re-analyzed without searching again."""
+    key = models.CharField(max_length=64, unique=True)
+    claim = models.TextField()  # Normalized claim text
+    search_results = models.JSONField(blank=True, null=True)
+    searched_at = models.DateTimeField(blank=True, null=True)
+    result = models.JSONField(blank=True, null=True)
+    analyzed_at = models.DateTimeField(blank=True, null=True)
+    hits = models.PositiveIntegerField(default=0)
+    last_used_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.claim[:100]
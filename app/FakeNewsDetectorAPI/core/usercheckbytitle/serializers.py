@@ -1,3 +1,4 @@
+from django.conf import settings
 from rest_framework import serializers
 
 
@@ -6,4 +7,33 @@ class UserCheckSerializer(serializers.Serializer):
     user_news = serializers.CharField()
     
     class Meta:
-        fields = ['user_news', ]
\ No newline at end of file
+        fields = ['user_news', ]
+
+class BatchClaimSerializer(serializers.Serializer):
+    """Serializes one claim of a batch; `use_meta_model` overrides the batch's."""
+    user_news = serializers.CharField()
+    use_meta_model = serializers.BooleanField(required=False)
+
+
+class UserCheckBatchSerializer(serializers.Serializer):
+    """Serializes a batch of claims, given as strings or as claim objects."""
+    claims = serializers.ListField(
+        child=serializers.JSONField(), allow_empty=False,
+        max_length=getattr(settings, 'USERCHECK_BATCH_MAX_CLAIMS', 500)
+    )
+    use_meta_model = serializers.BooleanField(default=False)
+
+    def validate_claims(self, claims):
+        validated = []
+        errors = {}
+        for index, claim in enumerate(claims):
+            if isinstance(claim, str):
+                claim = {'user_news': claim}
+            serializer = BatchClaimSerializer(data=claim)
+            if serializer.is_valid():
+                validated.append(serializer.validated_data)
+            else:
+                errors[index] = serializer.errors
+        if errors:
+            raise serializers.ValidationError(errors)
+        return validated
@@ -1,3 +1,86 @@
-from django.test import TestCase
+import json
+import threading
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase, TestCase
+
+from core.similarity import MinHashIndex
+from . import verification_cache
+from .viewsets import UserCheckViewSet
+
+
+class SimilarClaimTests(TestCase):
+    """Verdicts reused across near-duplicate claims"""
+
+    CLAIM = 'The government announced that all public schools in Delhi will close on Monday for 3 days due to the heatwave'
+
+    def setUp(self):
+        # In-memory index, so the test neither reads nor writes similarity/
+        self._saved_index = verification_cache._claim_index
+        verification_cache._claim_index = MinHashIndex(verification_cache.CLAIM_MATCH_THRESHOLD)
+        self.addCleanup(setattr, verification_cache, '_claim_index', self._saved_index)
+
+        claim = verification_cache.normalize_claim(self.CLAIM)
+        verification_cache.store(
+            verification_cache.claim_key(claim), claim, result={'verdict': 'TRUE'}
+        )
+
+    def find_similar(self, text):
+        claim = verification_cache.normalize_claim(text)
+        return verification_cache.find_similar_result(claim, verification_cache.claim_key(claim))
+
+    def test_reworded_claim_reuses_verdict(self):
+        similar = self.find_similar(self.CLAIM.replace('The government', 'Government'))
+        self.assertIsNotNone(similar)
+        self.assertEqual(similar[0], {'verdict': 'TRUE'})
+
+    def assert_miss(self, text):
+        # Close enough for the index, but it must not get the verdict
+        self.assertIsNotNone(verification_cache.get_claim_index().query(
+            verification_cache.normalize_claim(text)
+        ))
+        self.assertIsNone(self.find_similar(text))
+
+    def test_negated_claim_is_a_miss(self):
+        self.assert_miss(self.CLAIM.replace('will close', 'will not close'))
+        self.assert_miss(self.CLAIM.replace('will close', "won't close"))
+
+    def test_claim_with_other_numbers_is_a_miss(self):
+        self.assert_miss(self.CLAIM.replace('for 3 days', 'for 10 days'))
+
+
+class BatchStreamingTests(SimpleTestCase):
+    """NDJSON batches served under ASGI"""
+
+    def test_first_line_arrives_before_the_batch_finishes(self):
+        release = threading.Event()
+        finished = threading.Event()
+
+        def verify_claim(self, user_news):
+            release.wait(timeout=5)
+            finished.set()
+            return {'verdict': 'TRUE'}
+
+        async def check():
+            response = await self.async_client.post(
+                '/api/usercheck/title/batch/',
+                {'claims': ['A fast claim', {'user_news': 'A slow claim', 'use_meta_model': True}]},
+                content_type='application/json',
+            )
+            self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+            lines = aiter(response.streaming_content)
+            first = json.loads(await anext(lines))
+            # The meta model claim is still running
+            self.assertEqual(first['index'], 0)
+            self.assertFalse(finished.is_set())
+
+            release.set()
+            second = json.loads(await anext(lines))
+            self.assertEqual(second, {'index': 1, 'verdict': 'TRUE'})
+
+        with mock.patch.object(UserCheckViewSet, 'verify_claim', verify_claim):
+            try:
+                async_to_sync(check)()
+            finally:
+                release.set()
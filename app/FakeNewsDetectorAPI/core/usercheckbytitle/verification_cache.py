@@ -0,0 +1,190 @@
+"""
+Persistent cache in front of `MetaNewsVerifier.verify_news`
+Claims are normalized (casefolded, punctuation and extra whitespace removed)
+before hashing, so trivially different spellings of a viral claim share an entry
+"""
+
+from datetime import timedelta
+import hashlib
+import os
+import re
+import threading
+import unicodedata
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.db.models import F
+from django.utils import timezone
+
+from core.similarity import MinHashIndex
+from .models import VerificationCache
+
+SEARCH_TTL = getattr(settings, 'VERIFY_CACHE_SEARCH_TTL', 6 * 3600)
+VERDICT_TTL = getattr(settings, 'VERIFY_CACHE_VERDICT_TTL', 3600)
+MAX_ENTRIES = getattr(settings, 'VERIFY_CACHE_MAX_ENTRIES', 5000)
+
+# Claims at least this similar (Jaccard over word bigrams) to a verified claim
+# are answered with its verdict
+CLAIM_MATCH_THRESHOLD = getattr(settings, 'CLAIM_MATCH_THRESHOLD', 0.7)
+SIMILARITY_INDEX_DIR = getattr(
+    settings, 'SIMILARITY_INDEX_DIR', os.path.join(settings.BASE_DIR, 'similarity')
+)
+CLAIM_INDEX_PATH = os.path.join(SIMILARITY_INDEX_DIR, 'claims.json')
+
+# Hit/miss counters, per outcome of a lookup
+HIT = 'hit'                # Cached verdict returned as is
+SIMILAR_HIT = 'similar_hit'  # Verdict of a near-duplicate claim returned
+SEARCH_HIT = 'search_hit'  # Cached search results re-analyzed
+MISS = 'miss'              # Searched and analyzed from scratch
+COUNTER_KEY = 'usercheck:verify-cache:%s'
+
+WHITESPACE = re.compile(r'\s+')
+
+# Words that flip or deny a claim: a near-duplicate claim only shares a verdict
+# if it has the same ones, and the same numbers
+NEGATIONS = frozenset((
+    'not', 'no', 'never', 'none', 'nobody', 'nothing', 'neither', 'nor', 'cannot', 'without',
+    'false', 'fake', 'hoax', 'untrue', 'myth', 'debunked', 'deny', 'denies', 'denied', 'denying',
+))
+# "isn't" is normalized to "isn t"
+CONTRACTED_NOT = re.compile(r'(\w)n t\b')
+NUMBER = re.compile(r'\d+')
+
+
+def normalize_claim(claim):
+    """Casefolds a claim, drops punctuation and collapses whitespace."""
+    claim = unicodedata.normalize('NFKC', claim).casefold()
+    claim = ''.join(
+        ' ' if unicodedata.category(char).startswith('P') else char for char in claim
+    )
+    return WHITESPACE.sub(' ', claim).strip()
+
+
+def claim_polarity(normalized_claim):
+    """Returns the negation words and the numbers of a normalized claim, in order."""
+    words = CONTRACTED_NOT.sub(r'\1 not', normalized_claim).split()
+    return (
+        tuple(word for word in words if word in NEGATIONS),
+        tuple(NUMBER.findall(normalized_claim)),
+    )
+
+
+def claim_key(normalized_claim):
+    return hashlib.sha256(normalized_claim.encode()).hexdigest()
+
+
+def record(outcome):
+    key = COUNTER_KEY % outcome
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def get_cache_stats():
+    """Returns the hit/miss counters and the number of entries.
+
+    The counters cover a single process unless the cache backend is shared.
+    """
+    stats = {outcome: cache.get(COUNTER_KEY % outcome, 0) for outcome in (HIT, SIMILAR_HIT, SEARCH_HIT, MISS)}
+    stats['entries'] = VerificationCache.objects.count()
+    return stats
+
+
+_claim_index = None
+_claim_index_lock = threading.Lock()
+
+
+def get_claim_index():
+    """Returns the similarity index of verified claims, keyed on claim keys.
+
+    It is loaded from its last snapshot, or rebuilt from the cached verdicts.
+    """
+    global _claim_index
+    if _claim_index is None:
+        with _claim_index_lock:
+            if _claim_index is None:
+                index = MinHashIndex(CLAIM_MATCH_THRESHOLD, max_entries=MAX_ENTRIES, path=CLAIM_INDEX_PATH)
+                if not index.load():
+                    oldest = timezone.now() - timedelta(seconds=VERDICT_TTL)
+                    verified = VerificationCache.objects.filter(analyzed_at__gte=oldest).order_by('analyzed_at')
+                    for key, claim, analyzed_at in verified.values_list('key', 'claim', 'analyzed_at'):
+                        index.add(key, claim, added_at=analyzed_at.timestamp())
+                _claim_index = index
+    return _claim_index
+
+
+def find_similar_result(claim, key):
+    """Returns `(result, matched_claim, similarity)` of the most similar claim
+    with a fresh cached verdict, or None.
+
+    The claims must also have the same negations and numbers: "schools will
+    not close on Monday" does not get the verdict of "schools will close on
+    Monday", however similar their words.
+    """
+    match = get_claim_index().query(claim, max_age=VERDICT_TTL)
+    if match is None or match.key == key:
+        return None
+    if claim_polarity(claim) != claim_polarity(match.text):
+        return None
+    _, result = lookup(match.key)
+    if result is None:
+        return None
+    return result, match.text, match.similarity
+
+
+def _is_fresh(timestamp, ttl, now):
+    return timestamp is not None and now - timestamp < timedelta(seconds=ttl)
+
+
+def lookup(key):
+    """Returns `(search_results, result)` cached for a claim key.
+
+    Either value is None when missing or expired. A lookup that finds anything
+    bumps the entry's hit count and LRU timestamp.
+    """
+    entry = VerificationCache.objects.filter(key=key).first()
+    if entry is None:
+        return None, None
+
+    now = timezone.now()
+    search_results = entry.search_results if _is_fresh(entry.searched_at, SEARCH_TTL, now) else None
+    result = entry.result if _is_fresh(entry.analyzed_at, VERDICT_TTL, now) else None
+    if search_results is not None or result is not None:
+        VerificationCache.objects.filter(pk=entry.pk).update(hits=F('hits') + 1, last_used_at=now)
+    return search_results, result
+
+
+def store(key, claim, **fields):
+    """Saves search results (`search_results=`) and/or a verdict (`result=`)."""
+    now = timezone.now()
+    values = {'last_used_at': now}
+    if 'search_results' in fields:
+        values.update(search_results=fields['search_results'], searched_at=now)
+    if 'result' in fields:
+        values.update(result=fields['result'], analyzed_at=now)
+        claim_index = get_claim_index()
+        claim_index.add(key, claim, added_at=now.timestamp())
+        claim_index.maybe_save()
+
+    if VerificationCache.objects.filter(key=key).update(**values):
+        return
+    try:
+        VerificationCache.objects.create(key=key, claim=claim, **values)
+    except IntegrityError:
+        # Another request cached the same claim in the meantime
+        VerificationCache.objects.filter(key=key).update(**values)
+        return
+    evict()
+
+
+def evict(max_entries=MAX_ENTRIES):
+    """Deletes the least recently used entries beyond `max_entries`."""
+    stale_ids = list(
+        VerificationCache.objects.order_by('-last_used_at')
+        .values_list('id', flat=True)[max_entries:]
+    )
+    if stale_ids:
+        VerificationCache.objects.filter(id__in=stale_ids).delete()
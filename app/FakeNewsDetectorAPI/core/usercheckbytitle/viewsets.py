@@ -1,17 +1,33 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections
+from django.http import JsonResponse, StreamingHttpResponse
+from django.core.serializers.json import DjangoJSONEncoder
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.response import Response
-from .serializers import UserCheckSerializer
-from core.model import load_models
+from rest_framework.views import APIView
+from .serializers import UserCheckSerializer, UserCheckBatchSerializer
+from core.model import explain_titles, model_registry
 from .meta_model import MetaNewsVerifier
+from .verification_cache import get_cache_stats
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Tokens explaining a traditional model prediction
+TOP_TOKENS = getattr(settings, 'USERCHECK_TOP_TOKENS', 5)
+
+# Claims of one batch verified with the meta model at the same time
+BATCH_META_PARALLELISM = getattr(settings, 'USERCHECK_BATCH_META_PARALLELISM', 4)
+
 class UserCheckViewSet(viewsets.ViewSet):
     """Viewset to handle user checking other news."""
     http_method_names = ('post', )
     serializer_class = UserCheckSerializer
-    nb_model, vect_model = load_models()
     meta_verifier = MetaNewsVerifier()
 
     def create(self, request):
@@ -38,14 +54,154 @@ class UserCheckViewSet(viewsets.ViewSet):
             else:
                 # Use existing traditional ML model
                 logger.info("Using traditional ML model")
-                input_data_list = [input_data]
-                vectorized_text = self.vect_model.transform(input_data_list)
-                prediction = self.nb_model.predict(vectorized_text)
-                prediction_bool = True if prediction[0] == 1 else False
-                
-                response_data = {'prediction': prediction_bool}
+                response_data = explain_titles([input_data], top_k=TOP_TOKENS)[0]
                 logger.info(f"Traditional model result: {response_data}")
                 return Response(response_data)
         else:
             logger.error(f"Validation errors: {serializer.errors}")
             return Response(serializer.errors, status=400)
+
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        """Checks a batch of claims, streaming one NDJSON line per claim.
+
+        Every line carries the claim's `index` in the request. Claims checked
+        with the traditional model are scored together and come first; claims
+        checked with the meta model follow as they complete. A failing claim
+        gets an `error` line instead of failing the batch.
+        """
+        serializer = UserCheckBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            logger.error(f"Validation errors: {serializer.errors}")
+            return Response(serializer.errors, status=400)
+
+        use_meta_model = serializer.validated_data['use_meta_model']
+        fast_claims = []
+        meta_claims = []
+        for index, claim in enumerate(serializer.validated_data['claims']):
+            if claim.get('use_meta_model', use_meta_model):
+                meta_claims.append((index, claim['user_news']))
+            else:
+                fast_claims.append((index, claim['user_news']))
+        logger.info(f"Batch of {len(fast_claims)} traditional and {len(meta_claims)} meta model claims")
+
+        lines = (
+            json.dumps(result, cls=DjangoJSONEncoder) + '\n'
+            for result in self.batch_results(fast_claims, meta_claims)
+        )
+        # Under ASGI, Django reads a sync iterator to the end before sending it
+        if isinstance(request._request, ASGIRequest):
+            lines = iterate_in_thread(lines)
+        return StreamingHttpResponse(lines, content_type='application/x-ndjson')
+
+    def batch_results(self, fast_claims, meta_claims):
+        if fast_claims:
+            try:
+                scores = explain_titles([user_news for _, user_news in fast_claims], top_k=TOP_TOKENS)
+            except Exception as e:
+                logger.error(f"Batch prediction error: {e}")
+                for index, _ in fast_claims:
+                    yield {'index': index, 'error': f"Prediction error: {e}"}
+            else:
+                for (index, _), score in zip(fast_claims, scores):
+                    yield {'index': index, **score}
+
+        if not meta_claims:
+            return
+        executor = ThreadPoolExecutor(
+            max_workers=min(BATCH_META_PARALLELISM, len(meta_claims)),
+            thread_name_prefix='usercheck-batch'
+        )
+        futures = {
+            executor.submit(self.verify_claim, user_news): index
+            for index, user_news in meta_claims
+        }
+        try:
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    yield {'index': index, **future.result()}
+                except Exception as e:
+                    logger.error(f"Batch meta model error: {e}")
+                    yield {'index': index, 'error': str(e)}
+        finally:
+            # Client went away or the batch is done: drop claims not started yet
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def verify_claim(self, user_news):
+        try:
+            return self.meta_verifier.verify_news(user_news)
+        finally:
+            close_old_connections()
+
+
+async def iterate_in_thread(iterator):
+    """Iterates a sync generator from async code, one item per `sync_to_async` call.
+
+    The generator is closed when the iteration stops early, e.g. when the
+    client disconnects.
+    """
+    done = object()
+    step = sync_to_async(next, thread_sensitive=True)
+    try:
+        while True:
+            item = await step(iterator, done)
+            if item is done:
+                return
+            yield item
+    finally:
+        await sync_to_async(iterator.close, thread_sensitive=True)()
+
+
+def sse_event(event, data):
+    """Formats one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+async def user_check_stream(request):
+    """Verifies news with the meta model, streaming server-sent events.
+
+    Emits the search results first, then the model's answer token by token and
+    finally the verdict. Streaming needs an ASGI server; under WSGI the
+    response is only sent once complete.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+
+    try:
+        data = json.loads(request.body) if request.content_type == 'application/json' else request.POST
+    except ValueError:
+        return JsonResponse({'detail': 'JSON parse error'}, status=400)
+
+    serializer = UserCheckSerializer(data=data)
+    if not serializer.is_valid():
+        logger.error(f"Validation errors: {serializer.errors}")
+        return JsonResponse(serializer.errors, status=400)
+    input_data = serializer.validated_data['user_news']
+    logger.info(f"Streaming meta model check for: {input_data}")
+
+    async def events():
+        async for event, payload in UserCheckViewSet.meta_verifier.stream_verify_news(input_data):
+            yield sse_event(event, payload)
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+# Plain Django view: exempt it from CSRF like the DRF views
+user_check_stream.csrf_exempt = True
+
+
+class UserCheckMetricsView(APIView):
+    """Reports the traditional model serving the checks and the verification
+    cache counters of the process answering"""
+
+    def get(self, request):
+        return Response({
+            'model': model_registry.info(),
+            'verify_cache': get_cache_stats(),
+        })